@@ -59,6 +59,8 @@ def load_env_vars() -> Dict[str, str]:
     env_vars["HOST"] = os.environ.get("HOST", "0.0.0.0")
     env_vars["DEBUG"] = os.environ.get("DEBUG", "False").lower() == "true"
     env_vars["FRONTEND_URL"] = os.environ.get("FRONTEND_URL", "http://localhost:3000")
+    # Directory for persisting model builds across restarts; unset or empty keeps the cache in memory only
+    env_vars["MODEL_CACHE_DIR"] = os.environ.get("MODEL_CACHE_DIR", "")
     
     return env_vars
 
@@ -153,6 +155,12 @@ class AppConfig:
         """Get frontend URL for CORS configuration"""
         return self.env.get("FRONTEND_URL", "http://localhost:3000")
 
+    @property
+    def model_cache_dir(self) -> Optional[Path]:
+        """Get the directory for cached model builds, None if disabled"""
+        cache_dir = self.env.get("MODEL_CACHE_DIR")
+        return Path(cache_dir) if cache_dir else None
+
 
 # Create a global instance for importing elsewhere
 config = AppConfig() 
\ No newline at end of file
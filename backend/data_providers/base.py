@@ -2,6 +2,7 @@
 Base interface for financial data providers.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 
@@ -25,6 +26,29 @@ class DataProviderInterface(ABC):
         """
         pass
     
+    async def get_company_profiles_batch(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get basic information about several companies.
+        
+        Providers with a multi-ticker endpoint should override this; the default
+        runs the single-ticker lookups concurrently.
+        
+        Args:
+            tickers: The stock ticker symbols
+            
+        Returns:
+            Dictionary mapping each ticker to its company information; tickers
+            that cannot be retrieved are omitted
+        """
+        results = await asyncio.gather(
+            *(self.get_company_profile(ticker) for ticker in tickers),
+            return_exceptions=True
+        )
+        return {
+            ticker: result for ticker, result in zip(tickers, results)
+            if not isinstance(result, BaseException)
+        }
+    
     @abstractmethod
     async def get_income_statements(
         self, 
@@ -115,6 +139,34 @@ class DataProviderInterface(ABC):
         """
         pass
     
+    async def get_key_metrics_batch(
+        self,
+        tickers: List[str],
+        period: str = 'annual'
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get key financial metrics for several companies.
+        
+        Providers with a multi-ticker endpoint should override this; the default
+        runs the single-ticker lookups concurrently.
+        
+        Args:
+            tickers: The stock ticker symbols
+            period: 'annual' or 'quarterly'
+            
+        Returns:
+            Dictionary mapping each ticker to its key metrics; tickers that
+            cannot be retrieved are omitted
+        """
+        results = await asyncio.gather(
+            *(self.get_key_metrics(ticker, period=period) for ticker in tickers),
+            return_exceptions=True
+        )
+        return {
+            ticker: result for ticker, result in zip(tickers, results)
+            if not isinstance(result, BaseException)
+        }
+    
     @abstractmethod
     async def get_sector_peers(self, ticker: str) -> List[str]:
         """
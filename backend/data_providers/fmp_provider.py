@@ -8,6 +8,7 @@ from fastapi import HTTPException, status
 
 from config import config
 from data_providers.base import DataProviderInterface
+from data_providers.http_client import get_http_client
 
 class FMPProvider(DataProviderInterface):
     """FinancialModelingPrep API provider implementation"""
@@ -45,26 +46,26 @@ class FMPProvider(DataProviderInterface):
         params["apikey"] = self.api_key
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params, timeout=30.0)
-                
-                if response.status_code != 200:
-                    raise HTTPException(
-                        status_code=status.HTTP_502_BAD_GATEWAY,
-                        detail=f"FMP API error: {response.text}"
-                    )
-                
-                data = response.json()
-                
-                # Check for API error responses (usually empty list or error message)
-                # if isinstance(data, list) and len(data) == 0:
-                #     raise HTTPException(
-                #         status_code=status.HTTP_404_NOT_FOUND,
-                #         detail="No data found for the requested resource"
-                #     )
-                
-                return data
-                
+            client = get_http_client()
+            response = await client.get(url, params=params, timeout=30.0)
+            
+            if response.status_code != 200:
+                raise HTTPException(
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    detail=f"FMP API error: {response.text}"
+                )
+            
+            data = response.json()
+            
+            # Check for API error responses (usually empty list or error message)
+            # if isinstance(data, list) and len(data) == 0:
+            #     raise HTTPException(
+            #         status_code=status.HTTP_404_NOT_FOUND,
+            #         detail="No data found for the requested resource"
+            #     )
+            
+            return data
+            
         except httpx.RequestError as e:
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
@@ -84,6 +85,20 @@ class FMPProvider(DataProviderInterface):
         
         return data[0]
     
+    async def get_company_profiles_batch(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get company profiles for several tickers in one request"""
+        if not tickers:
+            return {}
+        
+        endpoint = f"profile/{','.join(tickers)}"
+        data = await self._make_request(endpoint)
+        
+        requested = set(tickers)
+        return {
+            item["symbol"]: item for item in data or []
+            if isinstance(item, dict) and item.get("symbol") in requested
+        }
+    
     async def get_income_statements(
         self, 
         ticker: str, 
@@ -0,0 +1,70 @@
+"""
+Shared HTTP client for the data providers.
+"""
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+# One keep-alive pool for every provider instance, so repeated API calls reuse open TCP/TLS connections
+_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+
+# The client is bound to a single event loop at a time; callers that run providers on a new loop
+# must close_http_client() before the previous loop ends
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _close_on_own_loop(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Close a client that belongs to another event loop.
+
+    Args:
+        client: Open client created on loop
+        loop: Event loop the client's pooled connections belong to
+
+    Raises:
+        RuntimeError: If that loop is no longer running, so the client can't be closed on it
+    """
+    if loop.is_closed() or not loop.is_running():
+        raise RuntimeError(
+            "Shared HTTP client is still open on an event loop that is no longer running; "
+            "await close_http_client() before that loop ends"
+        )
+    asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client, creating it on first use in the running event loop.
+
+    Returns:
+        Pooled httpx.AsyncClient
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is not None and not _client.is_closed and _client_loop is loop:
+        return _client
+    # Pooled connections belong to the event loop that opened them, so the old pool is closed there
+    if _client is not None and not _client.is_closed:
+        _close_on_own_loop(_client, _client_loop)
+    _client = httpx.AsyncClient(limits=_LIMITS)
+    _client_loop = loop
+    return _client
+
+
+async def close_http_client() -> None:
+    """
+    Close the shared HTTP client and its pooled connections.
+    """
+    global _client, _client_loop
+    client, client_loop = _client, _client_loop
+    _client = None
+    _client_loop = None
+    if client is None or client.is_closed:
+        return
+    if client_loop is asyncio.get_running_loop():
+        await client.aclose()
+    else:
+        _close_on_own_loop(client, client_loop)
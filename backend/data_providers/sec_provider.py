@@ -9,6 +9,7 @@ from fastapi import HTTPException, status
 
 from config import config
 from data_providers.base import DataProviderInterface
+from data_providers.http_client import get_http_client
 
 class SECProvider(DataProviderInterface):
     """SEC API provider implementation (sec-api.io)"""
@@ -43,26 +44,26 @@ class SECProvider(DataProviderInterface):
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                if json_data:
-                    response = await client.post(url, json=json_data, headers=headers, timeout=60.0)
-                else:
-                    response = await client.get(url, headers=headers, timeout=30.0)
-                
-                if response.status_code != 200:
-                    raise HTTPException(
-                        status_code=status.HTTP_502_BAD_GATEWAY,
-                        detail=f"SEC API error: {response.text}"
-                    )
-                
-                try:
-                    return response.json()
-                except httpx.JSONDecodeError as e:
-                    raise HTTPException(
-                        status_code=status.HTTP_502_BAD_GATEWAY,
-                        detail=f"SEC API response is not valid JSON: {str(e)} - Response text: {response.text}"
-                    )
-                
+            client = get_http_client()
+            if json_data:
+                response = await client.post(url, json=json_data, headers=headers, timeout=60.0)
+            else:
+                response = await client.get(url, headers=headers, timeout=30.0)
+            
+            if response.status_code != 200:
+                raise HTTPException(
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    detail=f"SEC API error: {response.text}"
+                )
+            
+            try:
+                return response.json()
+            except httpx.JSONDecodeError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    detail=f"SEC API response is not valid JSON: {str(e)} - Response text: {response.text}"
+                )
+            
         except httpx.RequestError as e:
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
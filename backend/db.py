@@ -3,6 +3,7 @@ Database client for Supabase integration.
 Handles all interactions with Supabase tables and storage.
 """
 
+import asyncio
 import json
 import time
 from datetime import datetime, timedelta
@@ -285,14 +286,17 @@ class SupabaseClient:
         timestamp = int(time.time())
         file_path = f"{user_id}/{timestamp}_{file_name}"
         
-        try:
-            response = client.storage.from_(STORAGE_BUCKET) \
-                .upload(file_path, file_data, {"content-type": "application/octet-stream"})
-                
-            # Get the public URL
-            file_url = client.storage.from_(STORAGE_BUCKET).get_public_url(file_path)
+        def upload() -> str:
+            bucket = client.storage.from_(STORAGE_BUCKET)
+            bucket.upload(file_path, file_data, {"content-type": "application/octet-stream"})
             
-            return file_url
+            # Get the public URL
+            return bucket.get_public_url(file_path)
+        
+        try:
+            # The storage client is synchronous; run the transfer in a worker thread so the
+            # event loop keeps serving requests while a large export uploads
+            return await asyncio.to_thread(upload)
             
         except Exception as e:
             print(f"Error uploading export file for user {user_id}: {e}")
@@ -1,8 +1,53 @@
+import atexit
+import logging
+import logging.handlers
 import os
+import queue
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
+# Loggers belonging to this backend; everything else (httpx logs full request URLs, FMP API key
+# included, at INFO) stays at the root logger's WARNING level
+_APP_LOGGER_NAMES = ("__main__", "load_env", "models", "data_providers", "storage", "exports")
+
+def set_app_log_level(level: int = logging.INFO):
+    """Set the level of this backend's own loggers, leaving third-party loggers at the root level."""
+    for name in _APP_LOGGER_NAMES:
+        logging.getLogger(name).setLevel(level)
+
+def configure_logging(level: int = logging.INFO):
+    """
+    Configure the root logger to hand records to a queue, so the stream I/O happens on a
+    background listener thread rather than in the event loop. The root logger stays at
+    WARNING; only the backend's own loggers are raised to level.
+    
+    Safe to call more than once (entry points may import each other): the queue handler and
+    listener are only installed by the first call.
+    """
+    root_logger = logging.getLogger()
+    if any(isinstance(handler, logging.handlers.QueueHandler) for handler in root_logger.handlers):
+        set_app_log_level(level)
+        return
+    
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    
+    root_logger.setLevel(logging.WARNING)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    set_app_log_level(level)
+    
+    listener.start()
+    atexit.register(listener.stop)
+
 def load_environment():
-    """Load environment variables from .env file"""
+    """
+    Set up the environment for the backend server (shared by the dev and production entry points):
+    1. Load environment variables from .env file
+    2. Add the backend directory to the Python path
+    """
     # Get the directory of the current file
     current_dir = os.path.dirname(os.path.abspath(__file__))
     
@@ -17,18 +62,17 @@ def load_environment():
     if current_dir not in sys.path:
         sys.path.insert(0, current_dir)
     
-    # Print loaded variables for debugging (without revealing sensitive values)
-    print("Loaded environment variables:")
+    # Log loaded variables for debugging (without revealing sensitive values)
+    logger.info("Loaded environment variables:")
     for var in ['SUPABASE_URL', 'FRONTEND_URL']:
-        if os.getenv(var):
-            print(f"  {var}: {os.getenv(var)}")
+        value = os.environ.get(var)
+        if value:
+            logger.info("  %s: %s", var, value)
     
-    # Check for sensitive variables without printing their values
+    # Check for sensitive variables without logging their values
     for var in ['SUPABASE_ANON_KEY', 'SUPABASE_SERVICE_ROLE_KEY', 'FMP_KEY', 'SEC_API_KEY']:
-        if os.getenv(var):
-            print(f"  {var}: [Set]")
-        else:
-            print(f"  {var}: [Not Set]")
+        logger.info("  %s: %s", var, "[Set]" if os.environ.get(var) else "[Not Set]")
 
 if __name__ == "__main__":
+    configure_logging()
     load_environment()
@@ -18,6 +18,7 @@ import traceback
 from auth import AuthService, get_user_from_request, require_verified_email, security
 from config import config
 from data_providers.provider_factory import get_data_provider
+from data_providers.http_client import close_http_client
 from models.request_models import CompanyInfoRequest, CreateModelRequest, UpdateModelRequest, ExportRequest, ExportType
 from models.response_models import (
     CompanyInfoResponse, ModelSummaryResponse, ModelDetailResponse, JobCreationResponse,
@@ -51,6 +52,11 @@ async def startup_event():
         if hasattr(route, "path"):
             print(f"  Path: {route.path}, Name: {route.name}, Methods: {route.methods if hasattr(route, 'methods') else 'N/A'}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Release the data providers' pooled connections
+    await close_http_client()
+
 # Add a test endpoint to verify API is working
 @app.get("/test")
 async def test_endpoint():
@@ -797,6 +803,7 @@ async def process_model_in_background(
         
         # Validate with ModelDetailResponse before storing in job status
         validated_model_detail = ModelDetailResponse(**processed_data_dict)
+        validated_model_detail_dict = validated_model_detail.dict() # Serialized once for both the DB row and the job status
 
         _update_job_progress(job_id, status="processing", stage="Saving model to database", percentage=95)
         # Store the full result in Supabase, then update job status
@@ -806,13 +813,13 @@ async def process_model_in_background(
             user_id=user_id,
             ticker=ticker.upper(),
             assumptions=assumptions,
-            results=validated_model_detail.dict(), # Store the validated and Pydantic-parsed model output
+            results=validated_model_detail_dict, # Store the validated and Pydantic-parsed model output
             # Add company_name to the create_model call if the table supports it
             # and if it's readily available. For now, assuming create_model in db.py doesn't require it separately.
             company_name=validated_model_detail.company_name # Pass company name if db.create_model supports it
         )
         
-        _update_job_progress(job_id, status="completed", stage="Model generation complete", percentage=100, data=validated_model_detail.dict())
+        _update_job_progress(job_id, status="completed", stage="Model generation complete", percentage=100, data=validated_model_detail_dict)
         print(f"Finished background processing for job_id: {job_id}")
 
     except Exception as e:
@@ -1827,7 +1834,8 @@ def _flatten_results_for_export(result: Dict[str, Any]) -> Dict[str, Any]:
 
 if __name__ == "__main__":
     # Load environment variables from .env file
-    from load_env import load_environment
+    from load_env import configure_logging, load_environment
+    configure_logging()
     load_environment()
     
     import uvicorn
@@ -68,55 +68,55 @@ class CapitalStructureGrid:
         # Get EBITDA and other key metrics
         ebitda = self.income_statement["ebitda"].iloc[1]  # Forward EBITDA
         
-        # Create grid datapoints
-        grid_points = []
+        # Every leverage scenario is closed-form in debt/EBITDA, so the whole range is evaluated as arrays
+        debt_to_ebitda = self.debt_to_ebitda_range
         
-        # Loop through leverage scenarios
-        for debt_to_ebitda in self.debt_to_ebitda_range:
-            # Calculate debt and relevant metrics
-            debt = ebitda * debt_to_ebitda
-            
-            # Calculate implied enterprise value (simplified)
-            ev_to_ebitda_multiple = 8.0  # Example multiple
-            enterprise_value = ebitda * ev_to_ebitda_multiple
-            
-            # Calculate equity value and debt-to-capital ratio
-            equity_value = enterprise_value - debt
-            if equity_value <= 0:
-                continue  # Skip negative equity scenarios
-                
-            debt_to_capital = debt / (debt + equity_value)
-            
-            # Calculate credit rating and cost of debt
-            credit_rating = self._determine_credit_rating(debt_to_ebitda)
-            cost_of_debt = self._calculate_cost_of_debt(credit_rating)
-            
-            # Calculate WACC
-            wacc = self._calculate_wacc(debt_to_capital, cost_of_debt)
-            
-            # Calculate equity IRR (simplified)
-            debt_to_capital_effect = (debt_to_capital * 2)  # Simplified leverage effect
-            equity_irr = self.base_discount_rate + debt_to_capital_effect
-            
-            # Calculate implied share price (simplified)
-            shares_outstanding = 100000000  # Example value
-            share_price = equity_value / shares_outstanding
-            
-            # Add to grid points
-            grid_points.append({
-                "debt_to_ebitda": debt_to_ebitda,
-                "debt_to_capital": debt_to_capital,
-                "debt": debt,
-                "equity_value": equity_value,
+        # Calculate debt and relevant metrics
+        debt = ebitda * debt_to_ebitda
+        
+        # Calculate implied enterprise value (simplified)
+        ev_to_ebitda_multiple = 8.0  # Example multiple
+        enterprise_value = ebitda * ev_to_ebitda_multiple
+        
+        # Calculate equity value and debt-to-capital ratio
+        equity_value = enterprise_value - debt
+        valid = equity_value > 0  # Skip negative equity scenarios
+        debt_to_ebitda = debt_to_ebitda[valid]
+        debt = debt[valid]
+        equity_value = equity_value[valid]
+        debt_to_capital = debt / (debt + equity_value)
+        
+        # Calculate credit rating and cost of debt
+        credit_ratings = [self._determine_credit_rating(ratio) for ratio in debt_to_ebitda]
+        cost_of_debt = np.array([self._calculate_cost_of_debt(rating) for rating in credit_ratings], dtype=float)
+        
+        # Calculate WACC
+        wacc = self._calculate_wacc(debt_to_capital, cost_of_debt)
+        
+        # Calculate equity IRR (simplified)
+        debt_to_capital_effect = (debt_to_capital * 2)  # Simplified leverage effect
+        equity_irr = self.base_discount_rate + debt_to_capital_effect
+        
+        # Calculate implied share price (simplified)
+        shares_outstanding = 100000000  # Example value
+        share_price = equity_value / shares_outstanding
+        
+        # Create grid datapoints
+        return [
+            {
+                "debt_to_ebitda": debt_to_ebitda[i],
+                "debt_to_capital": debt_to_capital[i],
+                "debt": debt[i],
+                "equity_value": equity_value[i],
                 "enterprise_value": enterprise_value,
-                "wacc": wacc,
-                "cost_of_debt": cost_of_debt,
-                "credit_rating": credit_rating,
-                "equity_irr": equity_irr,
-                "share_price": share_price
-            })
-        
-        return grid_points
+                "wacc": wacc[i],
+                "cost_of_debt": cost_of_debt[i],
+                "credit_rating": credit_ratings[i],
+                "equity_irr": equity_irr[i],
+                "share_price": share_price[i]
+            }
+            for i in range(len(debt_to_ebitda))
+        ]
     
     def _determine_credit_rating(self, debt_to_ebitda: float) -> str:
         """
@@ -163,11 +163,11 @@ class CapitalStructureGrid:
         Calculate the weighted average cost of capital.
         
         Args:
-            debt_to_capital: Debt to capital ratio
-            cost_of_debt: After-tax cost of debt
+            debt_to_capital: Debt to capital ratio (scalar or array)
+            cost_of_debt: After-tax cost of debt (scalar or array)
             
         Returns:
-            WACC (decimal)
+            WACC (decimal), shaped like the inputs
         """
         # Cost of equity (using a simplified CAPM)
         # As leverage increases, cost of equity increases due to financial risk
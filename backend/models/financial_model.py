@@ -3,15 +3,370 @@ Three-statement financial model implementation.
 Core business logic for the financial model.
 """
 
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, TYPE_CHECKING
 from datetime import datetime
+from collections import OrderedDict
+from dataclasses import dataclass, astuple
+from concurrent.futures import ThreadPoolExecutor
 
-from models.valuation_engine import DCFValuation, TradingCompsValuation, LBOValuation, ValuationEngine
-from models.capital_structure import CapitalStructureGrid
 from config import config # Import AppConfig
 
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    # Valuation models (and the data providers behind them) are imported lazily in build_model
+    from models.valuation_engine import DCFValuation, TradingCompsValuation, LBOValuation
+    from models.capital_structure import CapitalStructureGrid
+
+# Shared pool for the independent valuation calculations in build_model, reused across model builds
+_valuation_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="valuation")
+
+# Canonical statement layouts produced by ThreeStatementModel
+INCOME_STATEMENT_COLUMNS = ["year", "is_historical", "revenue", "gross_profit", "ebitda", "depreciation",
+                            "operating_income", "interest_expense", "income_before_tax", "taxes", "net_income"]
+BALANCE_SHEET_COLUMNS = ["year", "is_historical", "accounts_receivable", "inventory", "net_working_capital",
+                         "fixed_assets", "total_assets", "accounts_payable", "total_debt", "total_equity"]
+
+@dataclass(frozen=True)
+class _DefaultAssumptions:
+    """Model defaults from config.default_assumptions, flattened once instead of walked on every build."""
+    historical_growth_rate: float
+    historical_gross_margin: float
+    historical_ebitda_margin: float
+    discount_rate: float
+    terminal_growth_rate: float
+    tax_rate: float
+    ev_to_ebitda_multiple: float
+    lbo_exit_multiple: float
+    lbo_years: int
+    lbo_debt_to_ebitda: float
+    depreciation_percent_revenue: float
+    interest_percent_operating_income: float
+    receivable_days: float
+    inventory_days: float
+    payable_days: float
+    capex_percent_revenue: float
+    base_fixed_assets_revenue_multiple: float
+    target_debt_to_assets_ratio: float
+
+    @classmethod
+    def from_config(cls, default_assumptions: Dict[str, Any]) -> "_DefaultAssumptions":
+        """Resolve each default from the nested config, with the same fallbacks build_model used."""
+        return cls(
+            historical_growth_rate=default_assumptions.get("historical_growth_rate", 0.05),
+            historical_gross_margin=default_assumptions.get("historical_gross_margin", 0.50),
+            historical_ebitda_margin=default_assumptions.get("historical_ebitda_margin", 0.20),
+            discount_rate=default_assumptions.get("discount_rate", {}).get("wacc", {}).get("base_case", 0.10),
+            terminal_growth_rate=default_assumptions.get("terminal_growth_rate", {}).get("long_term_gdp_growth", 0.02),
+            tax_rate=default_assumptions.get("tax_rate", {}).get("effective_federal_state", 0.21),
+            ev_to_ebitda_multiple=default_assumptions.get("trading_multiples", {}).get("ev_to_ebitda", {}).get("median", 8.0),
+            lbo_exit_multiple=default_assumptions.get("lbo", {}).get("exit_multiple", 8.0),
+            lbo_years=default_assumptions.get("lbo", {}).get("holding_period_years", 5),
+            lbo_debt_to_ebitda=default_assumptions.get("lbo", {}).get("debt_to_ebitda", {}).get("initial", 3.0),
+            depreciation_percent_revenue=default_assumptions.get("financial_ratios", {}).get("depreciation_as_percent_of_revenue", 0.05),
+            interest_percent_operating_income=default_assumptions.get("financial_ratios", {}).get("interest_expense_as_percent_of_operating_income", 0.10),
+            receivable_days=default_assumptions.get("working_capital", {}).get("receivables_days", 45),
+            inventory_days=default_assumptions.get("working_capital", {}).get("inventory_days", 60),
+            payable_days=default_assumptions.get("working_capital", {}).get("payable_days", 30),
+            capex_percent_revenue=default_assumptions.get("capex", {}).get("capex_as_percent_of_revenue", {}).get("maintainance", 0.05),
+            base_fixed_assets_revenue_multiple=default_assumptions.get("balance_sheet_ratios", {}).get("fixed_assets_to_revenue", 0.70),
+            target_debt_to_assets_ratio=default_assumptions.get("capital_structure", {}).get("target_debt_to_total_capital", 0.30)
+        )
+
+_DEFAULTS = _DefaultAssumptions.from_config(config.default_assumptions)
+
+# build_model results keyed by company data and assumptions (see ThreeStatementModel._build_model_cache_key),
+# least recently used first; scenario UIs re-run identical assumptions often. An entry holds only what a hit
+# needs, the returned results and the statement column layouts, stored as JSON text so each hit decodes a
+# private copy. When config.model_cache_dir is set, builds are also persisted there as JSON files so they
+# survive restarts; the disk cache is off by default
+_BUILD_MODEL_CACHE_SIZE = 256
+_BUILD_MODEL_CACHE_VERSION = 2 # Bump when projection or valuation logic changes to invalidate builds on disk
+_BUILD_MODEL_DISK_CACHE_MAX_FILES = 1024 # Newest persisted builds kept, older ones are deleted
+_BUILD_MODEL_DISK_CACHE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+# Defaults fill in every assumption a request leaves out, so builds are keyed on them as well
+_DEFAULTS_DIGEST = hashlib.blake2b(repr(astuple(_DEFAULTS)).encode(), digest_size=16).hexdigest()
+_build_model_cache: "OrderedDict[Tuple[Any, ...], str]" = OrderedDict()
+_build_model_cache_lock = threading.Lock()
+
+def _json_default(value: Any) -> Any:
+    """Encode the NumPy values valuation results may hold as their Python equivalents."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _build_model_cache_path(cache_key: Tuple[Any, ...]) -> Optional[str]:
+    """File persisting the build for a cache key, None if the disk cache is disabled."""
+    cache_dir = config.model_cache_dir
+    if cache_dir is None:
+        return None
+    key_digest = hashlib.blake2b(repr((_BUILD_MODEL_CACHE_VERSION, cache_key)).encode(), digest_size=16).hexdigest()
+    return os.path.join(cache_dir, f"{key_digest}.json")
+
+def _get_cached_build(cache_key: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+    """Look up a finished build in memory, then on disk; the returned dict is the caller's own copy."""
+    with _build_model_cache_lock:
+        payload = _build_model_cache.get(cache_key)
+        if payload is not None:
+            _build_model_cache.move_to_end(cache_key)
+    if payload is not None:
+        return json.loads(payload)
+
+    cache_path = _build_model_cache_path(cache_key)
+    if cache_path is None:
+        return None
+    try:
+        if time.time() - os.path.getmtime(cache_path) > _BUILD_MODEL_DISK_CACHE_MAX_AGE_SECONDS:
+            return None
+        with open(cache_path, "r", encoding="utf-8") as cache_file:
+            payload = cache_file.read()
+        cached_build = json.loads(payload)
+    except FileNotFoundError:
+        return None
+    except Exception as e: # A corrupt or incompatible file is just a miss
+        logger.warning("Could not read cached model build %s: %s", cache_path, e)
+        return None
+    _remember_build(cache_key, payload)
+    return cached_build
+
+def _store_cached_build(cache_key: Tuple[Any, ...], cached_build: Dict[str, Any]) -> None:
+    """Keep a finished build in memory and persist it to disk."""
+    try:
+        payload = json.dumps(cached_build, default=_json_default)
+    except (TypeError, ValueError) as e: # Not cacheable; the build itself is still returned
+        logger.warning("Could not cache model build: %s", e)
+        return
+    _remember_build(cache_key, payload)
+
+    cache_path = _build_model_cache_path(cache_key)
+    if cache_path is None:
+        return
+    try:
+        cache_dir = os.path.dirname(cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see a partial build
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as cache_file:
+                cache_file.write(payload)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        _prune_persisted_builds(cache_dir)
+    except Exception as e: # Persisting is best effort; the in-memory cache still holds the build
+        logger.warning("Could not persist model build to %s: %s", cache_path, e)
+
+def _prune_persisted_builds(cache_dir: str) -> None:
+    """Delete persisted builds that have expired or fall outside the newest _BUILD_MODEL_DISK_CACHE_MAX_FILES."""
+    now = time.time()
+    cache_files = []
+    with os.scandir(cache_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json") and entry.is_file():
+                cache_files.append((entry.stat().st_mtime, entry.path))
+    cache_files.sort(reverse=True)
+    for index, (modified_at, path) in enumerate(cache_files):
+        if index >= _BUILD_MODEL_DISK_CACHE_MAX_FILES or now - modified_at > _BUILD_MODEL_DISK_CACHE_MAX_AGE_SECONDS:
+            try:
+                os.unlink(path)
+            except FileNotFoundError: # Already removed by a concurrent prune
+                pass
+
+def _remember_build(cache_key: Tuple[Any, ...], payload: str) -> None:
+    """Insert an encoded build into the in-memory LRU, evicting the least recently used beyond the cap."""
+    with _build_model_cache_lock:
+        _build_model_cache[cache_key] = payload
+        _build_model_cache.move_to_end(cache_key)
+        while len(_build_model_cache) > _BUILD_MODEL_CACHE_SIZE:
+            _build_model_cache.popitem(last=False)
+
+def _resolve_assumption(assumptions: Dict[str, Any], key: str, default: Any) -> Any:
+    """An assumption from the request, or the default when it is missing or None."""
+    value = assumptions.get(key)
+    return value if value is not None else default
+
+def _freeze_assumption(value: Any) -> Any:
+    """Convert an assumption value (possibly a nested dict/list) into a hashable equivalent."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze_assumption(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(_freeze_assumption(item) for item in value)
+    return value
+
+def project_income_statement_arrays(
+    base_revenue: Any,
+    growth_rates: np.ndarray,
+    gross_margins: np.ndarray,
+    ebitda_margins: np.ndarray,
+    effective_tax_rate: Any,
+    depreciation_percent_revenue: Any,
+    interest_percent_operating_income: Any
+) -> Dict[str, np.ndarray]:
+    """
+    Project income statement line items over the forecast horizon as arrays.
+
+    The forecast periods run along the last axis. Growth rates and margins shaped
+    (num_scenarios, forecast_periods) project every scenario in one pass; per-scenario
+    scalars (base revenue, tax/depreciation/interest rates) should then be shaped
+    (num_scenarios, 1) so they broadcast across the periods.
+
+    Args:
+        base_revenue: Revenue of the period preceding the first forecast year
+        growth_rates: Revenue growth rate per forecast period
+        gross_margins: Gross margin per forecast period
+        ebitda_margins: EBITDA margin per forecast period
+        effective_tax_rate: Tax rate applied to income before tax
+        depreciation_percent_revenue: Depreciation as a percentage of revenue
+        interest_percent_operating_income: Interest expense as a percentage of operating income
+
+    Returns:
+        Dictionary of line item name to array, in income statement column order
+    """
+    growth_rates = np.asarray(growth_rates, dtype=np.float64)
+    revenue = np.asarray(base_revenue, dtype=np.float64) * np.cumprod(1 + growth_rates, axis=-1)
+    gross_profit = revenue * gross_margins
+    ebitda = revenue * ebitda_margins
+
+    # Derived items are fused array expressions; each step writes into a row of one
+    # preallocated buffer instead of allocating a temporary per operation
+    derived = np.empty((6,) + np.broadcast_shapes(revenue.shape, ebitda.shape))
+    depreciation, operating_income, interest_expense, income_before_tax, taxes, net_income = derived
+    np.multiply(revenue, depreciation_percent_revenue, out=depreciation)
+    np.subtract(ebitda, depreciation, out=operating_income)
+    np.multiply(operating_income, interest_percent_operating_income, out=interest_expense)
+    np.subtract(operating_income, interest_expense, out=income_before_tax)
+    np.multiply(income_before_tax, effective_tax_rate, out=taxes)
+    np.subtract(income_before_tax, taxes, out=net_income)
+
+    return {
+        "revenue": revenue,
+        "gross_profit": gross_profit,
+        "ebitda": ebitda,
+        "depreciation": depreciation,
+        "operating_income": operating_income,
+        "interest_expense": interest_expense,
+        "income_before_tax": income_before_tax,
+        "taxes": taxes,
+        "net_income": net_income
+    }
+
+
+def project_cash_flow_arrays(
+    revenue: np.ndarray,
+    net_income: np.ndarray,
+    depreciation: np.ndarray,
+    change_in_working_capital: np.ndarray,
+    net_working_capital: np.ndarray,
+    prior_fixed_assets: np.ndarray,
+    capex_percent_revenue: Any,
+    debt_to_assets_ratio: Any,
+    initial_fixed_assets: Optional[Any] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Project forecast cash flow lines and the balance sheet items linked to them as arrays.
+
+    The forecast periods run along the last axis. Passing capex percentages and debt ratios
+    shaped (num_scenarios, 1) projects every scenario in one pass; the items that depend on
+    them come out shaped (num_scenarios, forecast_periods).
+
+    Args:
+        revenue: Forecast revenue per period
+        net_income: Forecast net income per period
+        depreciation: Forecast depreciation per period
+        change_in_working_capital: Cash impact of the NWC change per period
+        net_working_capital: Net working capital per period
+        prior_fixed_assets: Fixed assets carried into each period
+        capex_percent_revenue: Capital expenditure as a percentage of revenue
+        debt_to_assets_ratio: Target debt to total assets ratio
+        initial_fixed_assets: Fixed assets of the first period, overriding the capex roll-forward
+
+    Returns:
+        Dictionary of cash flow and linked balance sheet line items
+    """
+    # Multi-term sums accumulate into their first result with out= so each line item is a
+    # single allocation; every returned array is still its own buffer
+    capex = np.multiply(revenue, capex_percent_revenue)
+    np.negative(capex, out=capex) # Negative for outflow
+    operating_cash_flow = np.add(net_income, depreciation)
+    np.add(operating_cash_flow, change_in_working_capital, out=operating_cash_flow)
+    free_cash_flow = np.add(operating_cash_flow, capex)
+
+    fixed_assets = np.add(prior_fixed_assets, capex)
+    np.add(fixed_assets, depreciation, out=fixed_assets)
+    if initial_fixed_assets is not None and fixed_assets.shape[-1]:
+        fixed_assets[..., 0] = initial_fixed_assets
+    total_assets = np.add(net_working_capital, fixed_assets) # Other current assets might be missing
+    total_debt = np.multiply(total_assets, debt_to_assets_ratio)
+    total_equity = np.subtract(total_assets, total_debt)
+
+    return {
+        "operating_cash_flow": operating_cash_flow,
+        "capex": capex,
+        "free_cash_flow": free_cash_flow,
+        "fixed_assets": fixed_assets,
+        "total_assets": total_assets,
+        "total_debt": total_debt,
+        "total_equity": total_equity
+    }
+
+def _coerce_numeric_columns(frame: pd.DataFrame, columns: List[str]) -> None:
+    """
+    Make statement columns numeric in place, zero-filling missing values.
+
+    Columns that already hold a numeric dtype (the usual case, see _prepare_historical_data)
+    skip the parse; only object columns, e.g. strings from a raw provider payload, go
+    through pd.to_numeric.
+    """
+    for col in columns:
+        if not pd.api.types.is_numeric_dtype(frame[col]):
+            frame[col] = pd.to_numeric(frame[col], errors="coerce")
+    frame[columns] = frame[columns].fillna(0)
+
+def _frame_to_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Same records as frame.to_dict(orient="records"), built from one native list per column.
+
+    Each column is converted to Python scalars in a single .tolist() call and the row dicts are
+    zipped together, instead of pandas boxing every cell individually.
+    """
+    columns = list(frame.columns)
+    return [dict(zip(columns, row)) for row in zip(*(frame[col].tolist() for col in columns))]
+
+def _append_forecast_rows(historical: Optional[pd.DataFrame], forecast_columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Stack forecast rows under a historical statement block, one np.concatenate per column.
+
+    Avoids building an intermediate forecast DataFrame and the extra copy pd.concat makes.
+    Missing (NaN) forecast values are zero-filled in place.
+
+    Args:
+        historical: Historical block in the statement's column order, or None without history
+        forecast_columns: Forecast arrays keyed by column; their order is used without history
+
+    Returns:
+        Statement DataFrame with a fresh RangeIndex
+    """
+    for values in forecast_columns.values():
+        if values.dtype.kind == "f":
+            values[np.isnan(values)] = 0.0
+    if historical is None:
+        return pd.DataFrame(forecast_columns, copy=False)
+    return pd.DataFrame({
+        col: np.concatenate([historical[col].to_numpy(), forecast_columns[col]]) for col in historical.columns
+    }, copy=False)
+
 class ThreeStatementModel:
     """
     Three-statement financial model class.
@@ -44,9 +399,9 @@ class ThreeStatementModel:
         self.company_data = company_data # Use full company_data
         
         # Use provided defaults or fall back to AppConfig defaults
-        self.default_hist_growth = default_hist_growth if default_hist_growth is not None else config.default_assumptions.get("historical_growth_rate", 0.05)
-        self.default_hist_gross_margin = default_hist_gross_margin if default_hist_gross_margin is not None else config.default_assumptions.get("historical_gross_margin", 0.50)
-        self.default_hist_ebitda_margin = default_hist_ebitda_margin if default_hist_ebitda_margin is not None else config.default_assumptions.get("historical_ebitda_margin", 0.20)
+        self.default_hist_growth = default_hist_growth if default_hist_growth is not None else _DEFAULTS.historical_growth_rate
+        self.default_hist_gross_margin = default_hist_gross_margin if default_hist_gross_margin is not None else _DEFAULTS.historical_gross_margin
+        self.default_hist_ebitda_margin = default_hist_ebitda_margin if default_hist_ebitda_margin is not None else _DEFAULTS.historical_ebitda_margin
 
         # Initialize historical data tracking
         self.historical_statements_df = pd.DataFrame() # To store structured historical data
@@ -54,23 +409,35 @@ class ThreeStatementModel:
         self.num_historical_periods: int = 0
         self.latest_historical_year: Optional[int] = None
         self.base_historical_year: Optional[int] = None # Earliest historical year
+        self.latest_income: Dict[str, Any] = {} # Only populated by the legacy cold-start fallback
+        self.latest_revenue: float = 0.0 # Revenue of the latest historical period
 
         # Initialize empty DataFrames for financial statements
         self.income_statement = pd.DataFrame()
         self.balance_sheet = pd.DataFrame()
         self.cash_flow = pd.DataFrame()
+        self._historical_income_statement: Optional[pd.DataFrame] = None # Cached historical IS block, see _project_income_statement
+        self._historical_balance_sheet: Optional[pd.DataFrame] = None # Cached historical BS block, see _get_historical_balance_sheet
+        self._historical_cash_flow: Optional[pd.DataFrame] = None # Cached historical CF block, see _project_cash_flow
         
         # Initialize DCF and other valuation models
-        self.dcf_valuation = None
-        self.comps_valuation = None
-        self.lbo_valuation = None
-        self.cap_structure_grid = None
+        self.dcf_valuation: Optional["DCFValuation"] = None
+        self.comps_valuation: Optional["TradingCompsValuation"] = None
+        self.lbo_valuation: Optional["LBOValuation"] = None
+        self.cap_structure_grid: Optional["CapitalStructureGrid"] = None
         
         # Extract and prepare historical data
         self._prepare_historical_data()
+        
+        # Fingerprint of the raw company data for build_model cache keys, taken once per model
+        self._company_data_fingerprint = self._fingerprint_company_data()
     
     def _prepare_historical_data(self):
         """Extract and prepare historical financial data."""
+        # Canonical historical statement blocks are derived from the historical data prepared below
+        self._historical_income_statement = None
+        self._historical_balance_sheet = None
+        self._historical_cash_flow = None
         # Extract income statements
         income_statements_raw = self.company_data.get("income_statements", [])
         balance_sheets_raw = self.company_data.get("balance_sheets", []) # Assuming alignment
@@ -85,36 +452,38 @@ class ThreeStatementModel:
             self.num_historical_periods = 0
             return
 
-        # Process and store historical data
-        processed_historical = []
-        temp_historical_years = set()
-
-        for i, stmt_data in enumerate(income_statements_raw):
-            year_str = stmt_data.get("date", stmt_data.get("year", ""))
-            year = None
-            if isinstance(year_str, str) and year_str:
-                try:
-                    year = int(year_str[:4]) # Assuming YYYY-MM-DD or YYYY
-                except ValueError:
-                    pass # Could log a warning here
-            elif isinstance(year_str, int):
-                year = year_str
-            
-            if year:
-                temp_historical_years.add(year)
-                
-                # For now, just store the raw statement; transformation to DataFrame columns will happen later
-                # This assumes income_statements_raw, balance_sheets_raw, cash_flows_raw are aligned by period/index
-                period_data = {
-                    "year": year,
-                    "is_historical": True,
-                    **stmt_data, # Income statement items
-                    **(balance_sheets_raw[i] if i < len(balance_sheets_raw) else {}), # Balance sheet items
-                    **(cash_flows_raw[i] if i < len(cash_flows_raw) else {}) # Cash flow items
-                }
-                processed_historical.append(period_data)
+        # Parse all fiscal years in one vectorized pass (YYYY-MM-DD, YYYY or int year)
+        raw_dates = pd.Series(
+            [stmt_data.get("date", stmt_data.get("year", "")) for stmt_data in income_statements_raw],
+            dtype=object
+        )
+        parsed_years = pd.to_numeric(raw_dates.astype(str).str.slice(0, 4), errors="coerce")
+        valid_positions = np.flatnonzero((parsed_years.notna() & (parsed_years != 0)).to_numpy())
+        # Visit the valid periods in fiscal year order so the frame below is built already sorted; the
+        # index keeps each period's label as if the frame had been built first and sorted afterwards
+        year_order = np.argsort(parsed_years.to_numpy()[valid_positions].astype(np.int64), kind="quicksort")
+        valid_positions = valid_positions[year_order]
 
-        if not processed_historical: # No valid years found
+        # Gather the raw statements for valid periods straight into columns (first-seen key order, later
+        # statements overriding earlier keys, NaN where a period lacks an item) so the DataFrame below is
+        # built from one list per column rather than a list of per-period dicts
+        # This assumes income_statements_raw, balance_sheets_raw, cash_flows_raw are aligned by period/index
+        num_valid_periods = len(valid_positions)
+        processed_historical: Dict[str, List[Any]] = {
+            "year": [int(parsed_years.iat[i]) for i in valid_positions],
+            "is_historical": [True] * num_valid_periods
+        }
+        for row, i in enumerate(valid_positions):
+            for raw_statements in (income_statements_raw, balance_sheets_raw, cash_flows_raw):
+                if i >= len(raw_statements):
+                    continue
+                for key, value in raw_statements[i].items():
+                    column = processed_historical.get(key)
+                    if column is None:
+                        column = processed_historical[key] = [np.nan] * num_valid_periods
+                    column[row] = value
+
+        if not num_valid_periods: # No valid years found
             self.latest_income = {} # Keep this for now for base_revenue logic, will be refined
             self.historical_growth_rate = self.default_hist_growth
             self.historical_gross_margin = self.default_hist_gross_margin
@@ -123,23 +492,34 @@ class ThreeStatementModel:
             return
             
         # Create a DataFrame from processed historical data
-        self.historical_statements_df = pd.DataFrame(processed_historical)
-        
-        # Sort by year to ensure correct order
+        historical_df = pd.DataFrame(processed_historical, index=year_order)
+
+        # Hold the numeric statement items as one column-major (Fortran-order) float64 block,
+        # since everything downstream reduces or projects column by column
+        numeric_cols = [col for col in historical_df.select_dtypes(include=[np.number]).columns if col != "year"]
+        if numeric_cols:
+            numeric_block = np.asfortranarray(historical_df[numeric_cols].to_numpy(dtype=np.float64))
+            historical_df = pd.concat(
+                [historical_df.drop(columns=numeric_cols),
+                 pd.DataFrame(numeric_block, columns=numeric_cols, index=historical_df.index)],
+                axis=1
+            )[historical_df.columns]
+        self.historical_statements_df = historical_df
+
+        # Sort by year to ensure correct order (only needed if a raw "year" item overrode a parsed year)
         if "year" in self.historical_statements_df.columns:
-            self.historical_statements_df.sort_values(by="year", inplace=True)
+            if not self.historical_statements_df["year"].is_monotonic_increasing:
+                self.historical_statements_df.sort_values(by="year", inplace=True)
             self.historical_years = self.historical_statements_df["year"].tolist()
             self.num_historical_periods = len(self.historical_years)
             if self.historical_years:
                 self.latest_historical_year = self.historical_years[-1]
                 self.base_historical_year = self.historical_years[0]
         
-        # For compatibility with existing logic, self.latest_income can be the last historical period
-        # This might need refinement if specific fields are expected in self.latest_income
-        if not self.historical_statements_df.empty:
-            self.latest_income = self.historical_statements_df.iloc[-1].to_dict()
-        else: # Should not happen if processed_historical was populated and had years
-            self.latest_income = {}
+        # Revenue is the only field read from the latest period, so cache it instead of
+        # materializing the whole last row as a dict
+        if not self.historical_statements_df.empty and "revenue" in self.historical_statements_df.columns:
+            self.latest_revenue = self.historical_statements_df["revenue"].iloc[-1]
 
 
         # Recalculate historical metrics based on the new historical_statements_df
@@ -160,65 +540,56 @@ class ThreeStatementModel:
             self.historical_ebitda_margin = self.default_hist_ebitda_margin
             return
 
-        revenues = self.historical_statements_df["revenue"].fillna(0).tolist()
-        growth_rates = []
-        for i in range(1, len(revenues)):
-            if revenues[i-1] != 0: # Avoid division by zero
-                growth_rate = (revenues[i] - revenues[i-1]) / revenues[i-1]
-                growth_rates.append(growth_rate)
-        
-        self.historical_growth_rate = np.mean(growth_rates) if growth_rates else self.default_hist_growth
+        revenues = self.historical_statements_df["revenue"].to_numpy(dtype=np.float64, na_value=0.0)
+        prev_revenues = revenues[:-1]
+        has_prev_revenue = prev_revenues != 0 # Avoid division by zero
+        growth_rates = np.divide(revenues[1:] - prev_revenues, prev_revenues, out=np.zeros_like(prev_revenues), where=has_prev_revenue)
         
-        gross_margins = []
-        ebitda_margins = []
+        self.historical_growth_rate = float(growth_rates[has_prev_revenue].mean()) if has_prev_revenue.any() else self.default_hist_growth
         
-        for _, row in self.historical_statements_df.iterrows():
-            revenue = row.get("revenue", 0)
-            if revenue != 0: # Avoid division by zero
-                gross_profit = row.get("grossProfit", row.get("gross_profit", 0)) # Handle potential inconsistencies in naming
-                ebitda = row.get("ebitda", 0)
-                
-                gross_margins.append(gross_profit / revenue)
-                ebitda_margins.append(ebitda / revenue)
+        # Margins over the periods with revenue (avoid division by zero); missing items count as zero
+        margin_revenues = self.historical_statements_df["revenue"].to_numpy(dtype=np.float64)
+        has_revenue = margin_revenues != 0
+        gross_profit_col = next((col for col in ("grossProfit", "gross_profit") if col in self.historical_statements_df.columns), None) # Handle potential inconsistencies in naming
         
-        self.historical_gross_margin = np.mean(gross_margins) if gross_margins else self.default_hist_gross_margin
-        self.historical_ebitda_margin = np.mean(ebitda_margins) if ebitda_margins else self.default_hist_ebitda_margin
+        if has_revenue.any():
+            margin_revenues = margin_revenues[has_revenue]
+            gross_profits = self._historical_values(gross_profit_col)[has_revenue]
+            ebitdas = self._historical_values("ebitda")[has_revenue]
+            self.historical_gross_margin = np.mean(gross_profits / margin_revenues)
+            self.historical_ebitda_margin = np.mean(ebitdas / margin_revenues)
+        else:
+            self.historical_gross_margin = self.default_hist_gross_margin
+            self.historical_ebitda_margin = self.default_hist_ebitda_margin
+
+    def _historical_values(self, column: Optional[str]) -> np.ndarray:
+        """A historical statement column as float64 values, zeros if the column is absent."""
+        if column is None or column not in self.historical_statements_df.columns:
+            return np.zeros(len(self.historical_statements_df))
+        return self.historical_statements_df[column].to_numpy(dtype=np.float64)
     
     def build_model(self, assumptions: Dict[str, Any]) -> Dict[str, Any]:
         """
         Build the three-statement model based on provided assumptions.
         """
-        print(f"[build_model] Top: Raw assumptions received: {assumptions}")
+        from models.valuation_engine import DCFValuation, TradingCompsValuation, LBOValuation, extract_shares_outstanding
+        from models.capital_structure import CapitalStructureGrid
 
-        # Resolve assumptions for VALUATIONS first
-        discount_rate = assumptions.get("discount_rate")
-        if discount_rate is None: discount_rate = config.default_assumptions.get("discount_rate", {}).get("wacc", {}).get("base_case", 0.10)
-        print(f"[build_model] Using discount_rate for valuations: {discount_rate}")
+        logger.debug("[build_model] Top: Raw assumptions received: %s", assumptions)
 
-        terminal_growth_rate = assumptions.get("terminal_growth_rate")
-        if terminal_growth_rate is None: terminal_growth_rate = config.default_assumptions.get("terminal_growth_rate", {}).get("long_term_gdp_growth", 0.02)
-        print(f"[build_model] Using terminal_growth_rate for valuations: {terminal_growth_rate}")
+        # Identical company data and assumptions always produce the same model, so reuse an earlier build
+        cache_key = self._build_model_cache_key(assumptions)
+        cached_build = _get_cached_build(cache_key) if cache_key is not None else None
 
+        # Resolve assumptions for VALUATIONS first; a missing or None assumption falls back to the config default
+        discount_rate = _resolve_assumption(assumptions, "discount_rate", _DEFAULTS.discount_rate)
+        terminal_growth_rate = _resolve_assumption(assumptions, "terminal_growth_rate", _DEFAULTS.terminal_growth_rate)
         # This tax_rate is specifically for valuation (e.g., NOPAT calc in DCF, LBO taxes)
-        valuation_tax_rate = assumptions.get("tax_rate") 
-        if valuation_tax_rate is None: valuation_tax_rate = config.default_assumptions.get("tax_rate", {}).get("effective_federal_state", 0.21)
-        print(f"[build_model] Using tax_rate for valuations: {valuation_tax_rate}")
-
-        ev_to_ebitda_multiple = assumptions.get("ev_to_ebitda_multiple")
-        if ev_to_ebitda_multiple is None: ev_to_ebitda_multiple = config.default_assumptions.get("trading_multiples", {}).get("ev_to_ebitda", {}).get("median", 8.0)
-        print(f"[build_model] Using ev_to_ebitda_multiple for valuations: {ev_to_ebitda_multiple}")
-        
-        lbo_exit_multiple = assumptions.get("lbo_exit_multiple")
-        if lbo_exit_multiple is None: lbo_exit_multiple = config.default_assumptions.get("lbo", {}).get("exit_multiple", 8.0)
-        print(f"[build_model] Using lbo_exit_multiple for valuations: {lbo_exit_multiple}")
-
-        lbo_years = assumptions.get("lbo_years")
-        if lbo_years is None: lbo_years = config.default_assumptions.get("lbo", {}).get("holding_period_years", 5)
-        print(f"[build_model] Using lbo_years for valuations: {lbo_years}")
-
-        lbo_debt_to_ebitda = assumptions.get("debt_to_ebitda") # For LBO entry
-        if lbo_debt_to_ebitda is None: lbo_debt_to_ebitda = config.default_assumptions.get("lbo", {}).get("debt_to_ebitda", {}).get("initial", 3.0)
-        print(f"[build_model] Using LBO debt_to_ebitda for valuations: {lbo_debt_to_ebitda}")
+        valuation_tax_rate = _resolve_assumption(assumptions, "tax_rate", _DEFAULTS.tax_rate)
+        ev_to_ebitda_multiple = _resolve_assumption(assumptions, "ev_to_ebitda_multiple", _DEFAULTS.ev_to_ebitda_multiple)
+        lbo_exit_multiple = _resolve_assumption(assumptions, "lbo_exit_multiple", _DEFAULTS.lbo_exit_multiple)
+        lbo_years = _resolve_assumption(assumptions, "lbo_years", _DEFAULTS.lbo_years)
+        lbo_debt_to_ebitda = _resolve_assumption(assumptions, "debt_to_ebitda", _DEFAULTS.lbo_debt_to_ebitda) # For LBO entry
 
         # Now, resolve assumptions for PROJECTIONS (IS, BS, CF)
         revenue_growth_rates = assumptions.get("revenue_growth_rates", []) # Already a list
@@ -226,65 +597,75 @@ class ThreeStatementModel:
         ebitda_margins = assumptions.get("ebitda_margins", []) # Already a list
         
         # This tax_rate is for projecting income statement taxes
-        projection_tax_rate = assumptions.get("tax_rate") 
-        if projection_tax_rate is None: projection_tax_rate = config.default_assumptions.get("tax_rate", {}).get("effective_federal_state", 0.21)
-        # Ensure it's a float if it comes from form as int/str for percentage
-        # However, frontend should send it as decimal (e.g., 0.21 for 21%)
-        print(f"[build_model] Using tax_rate for projections: {projection_tax_rate}")
-
-        depreciation_percent_revenue = assumptions.get("depreciation_percent_revenue")
-        if depreciation_percent_revenue is None: depreciation_percent_revenue = config.default_assumptions.get("financial_ratios", {}).get("depreciation_as_percent_of_revenue", 0.05)
-        print(f"[build_model] Using depreciation_percent_revenue for projections: {depreciation_percent_revenue}")
-
+        # Frontend should send it as decimal (e.g., 0.21 for 21%)
+        projection_tax_rate = _resolve_assumption(assumptions, "tax_rate", _DEFAULTS.tax_rate)
+        depreciation_percent_revenue = _resolve_assumption(assumptions, "depreciation_percent_revenue", _DEFAULTS.depreciation_percent_revenue)
         # Interest expense is complex; this is a simplification. Real model would use debt schedule.
-        interest_percent_operating_income = assumptions.get("interest_percent_operating_income", 0.10) 
-        if interest_percent_operating_income is None: interest_percent_operating_income = config.default_assumptions.get("financial_ratios", {}).get("interest_expense_as_percent_of_operating_income", 0.10)
-        print(f"[build_model] Using interest_percent_operating_income for projections: {interest_percent_operating_income}")
-
-        receivable_days = assumptions.get("receivable_days")
-        if receivable_days is None: receivable_days = config.default_assumptions.get("working_capital", {}).get("receivables_days", 45)
-        
-        inventory_days = assumptions.get("inventory_days")
-        if inventory_days is None: inventory_days = config.default_assumptions.get("working_capital", {}).get("inventory_days", 60)
-        
-        payable_days = assumptions.get("payable_days")
-        if payable_days is None: payable_days = config.default_assumptions.get("working_capital", {}).get("payable_days", 30)
-
-        capex_percent_revenue = assumptions.get("capex_percent_revenue") 
-        if capex_percent_revenue is None: capex_percent_revenue = config.default_assumptions.get("capex", {}).get("capex_as_percent_of_revenue", {}).get("maintainance", 0.05)
-
-        base_fixed_assets_revenue_multiple = assumptions.get("base_fixed_assets_revenue_multiple")
-        if base_fixed_assets_revenue_multiple is None: base_fixed_assets_revenue_multiple = config.default_assumptions.get("balance_sheet_ratios", {}).get("fixed_assets_to_revenue", 0.70)
+        # An absent key means 10%; only an explicit None falls back to the config default
+        interest_percent_operating_income = assumptions.get("interest_percent_operating_income", 0.10)
+        if interest_percent_operating_income is None: interest_percent_operating_income = _DEFAULTS.interest_percent_operating_income
+        receivable_days = _resolve_assumption(assumptions, "receivable_days", _DEFAULTS.receivable_days)
+        inventory_days = _resolve_assumption(assumptions, "inventory_days", _DEFAULTS.inventory_days)
+        payable_days = _resolve_assumption(assumptions, "payable_days", _DEFAULTS.payable_days)
+        capex_percent_revenue = _resolve_assumption(assumptions, "capex_percent_revenue", _DEFAULTS.capex_percent_revenue)
+        base_fixed_assets_revenue_multiple = _resolve_assumption(assumptions, "base_fixed_assets_revenue_multiple", _DEFAULTS.base_fixed_assets_revenue_multiple)
 
         # `debt_ratio` from form (e.g., 30 for 30%) is used as `target_debt_to_assets_ratio` (e.g., 0.30)
         target_debt_to_assets_ratio = assumptions.get("debt_ratio") 
         if target_debt_to_assets_ratio is None: 
-            target_debt_to_assets_ratio = config.default_assumptions.get("capital_structure", {}).get("target_debt_to_total_capital", 0.30)
+            target_debt_to_assets_ratio = _DEFAULTS.target_debt_to_assets_ratio
         else: 
             target_debt_to_assets_ratio = target_debt_to_assets_ratio / 100.0 # Convert percentage to decimal
-        print(f"[build_model] Using target_debt_to_assets_ratio for BS projections: {target_debt_to_assets_ratio}")
-
-        # Generate income statement projections
-        self._project_income_statement(
-            revenue_growth_rates, 
-            gross_margins, 
-            ebitda_margins, 
-            projection_tax_rate, # Use the one resolved for projections
-            depreciation_percent_revenue,
-            interest_percent_operating_income
-        )
-        
-        self._project_balance_sheet(
-            receivable_days,
-            inventory_days,
-            payable_days,
-            capex_percent_revenue, 
-            base_fixed_assets_revenue_multiple,
-            target_debt_to_assets_ratio
-        )
-        
-        self._project_cash_flow(capex_percent_revenue, target_debt_to_assets_ratio)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[build_model] Using valuation assumptions: %s", {
+                "discount_rate": discount_rate, "terminal_growth_rate": terminal_growth_rate,
+                "tax_rate": valuation_tax_rate, "ev_to_ebitda_multiple": ev_to_ebitda_multiple,
+                "lbo_exit_multiple": lbo_exit_multiple, "lbo_years": lbo_years, "lbo_debt_to_ebitda": lbo_debt_to_ebitda
+            })
+            logger.debug("[build_model] Using projection assumptions: %s", {
+                "tax_rate": projection_tax_rate, "depreciation_percent_revenue": depreciation_percent_revenue,
+                "interest_percent_operating_income": interest_percent_operating_income,
+                "receivable_days": receivable_days, "inventory_days": inventory_days, "payable_days": payable_days,
+                "capex_percent_revenue": capex_percent_revenue,
+                "base_fixed_assets_revenue_multiple": base_fixed_assets_revenue_multiple,
+                "target_debt_to_assets_ratio": target_debt_to_assets_ratio
+            })
+
+        if cached_build is not None:
+            # Restore the statements from the cached records; the valuation objects are still built below,
+            # so every model owns its own
+            logger.debug("[build_model] Reusing cached model for %s", self.ticker)
+            cached_results = cached_build["results"]
+            cached_columns = cached_build["columns"]
+            self.income_statement = pd.DataFrame(cached_results["income_statement"], columns=cached_columns["income_statement"])
+            self.balance_sheet = pd.DataFrame(cached_results["balance_sheet"], columns=cached_columns["balance_sheet"])
+            self.cash_flow = pd.DataFrame(cached_results["cash_flow"], columns=cached_columns["cash_flow"])
+        else:
+            # Generate income statement projections
+            self._project_income_statement(
+                revenue_growth_rates, 
+                gross_margins, 
+                ebitda_margins, 
+                projection_tax_rate, # Use the one resolved for projections
+                depreciation_percent_revenue,
+                interest_percent_operating_income
+            )
+            
+            self._project_balance_sheet(
+                receivable_days,
+                inventory_days,
+                payable_days,
+                capex_percent_revenue, 
+                base_fixed_assets_revenue_multiple,
+                target_debt_to_assets_ratio
+            )
+            
+            self._project_cash_flow(capex_percent_revenue, target_debt_to_assets_ratio, base_fixed_assets_revenue_multiple)
         
+        # Shares outstanding are read from company_data once for all three valuations
+        shares_outstanding = extract_shares_outstanding(self.company_data)
+
         # DCF valuation (uses valuation_tax_rate)
         self.dcf_valuation = DCFValuation(
             self.income_statement, 
@@ -293,18 +674,18 @@ class ThreeStatementModel:
             discount_rate, # Resolved for valuations
             terminal_growth_rate, # Resolved for valuations
             valuation_tax_rate, # Resolved for valuations (e.g., for NOPAT)
-            self.company_data 
+            self.company_data,
+            shares_outstanding
         )
-        dcf_results = self.dcf_valuation.calculate()
         
         # Trading comps valuation
         self.comps_valuation = TradingCompsValuation(
             self.income_statement,
             self.balance_sheet,
             ev_to_ebitda_multiple, # Resolved for valuations
-            self.company_data 
+            self.company_data,
+            shares_outstanding
         )
-        comps_results = self.comps_valuation.calculate()
         
         # LBO valuation (uses valuation_tax_rate)
         self.lbo_valuation = LBOValuation(
@@ -316,9 +697,9 @@ class ThreeStatementModel:
             lbo_debt_to_ebitda, # Resolved for valuations
             discount_rate, 
             valuation_tax_rate, # Resolved for valuations     
-            self.company_data 
+            self.company_data,
+            shares_outstanding
         )
-        lbo_results = self.lbo_valuation.calculate()
         
         # Capital structure grid (uses valuation related discount_rate and tax_rate)
         self.cap_structure_grid = CapitalStructureGrid(
@@ -328,19 +709,246 @@ class ThreeStatementModel:
             discount_rate, 
             valuation_tax_rate 
         )
-        cap_structure_results = self.cap_structure_grid.calculate()
+        
+        if cached_build is not None:
+            return cached_results # Decoded for this call, so callers may mutate it
+
+        # The four valuations only read the finished statements, so they run concurrently
+        dcf_future = _valuation_executor.submit(self.dcf_valuation.calculate)
+        comps_future = _valuation_executor.submit(self.comps_valuation.calculate)
+        lbo_future = _valuation_executor.submit(self.lbo_valuation.calculate)
+        cap_structure_future = _valuation_executor.submit(self.cap_structure_grid.calculate)
+
+        dcf_results = dcf_future.result()
+        comps_results = comps_future.result()
+        lbo_results = lbo_future.result()
+        cap_structure_results = cap_structure_future.result()
         
         results = {
-            "income_statement": self.income_statement.to_dict(orient="records"),
-            "balance_sheet": self.balance_sheet.to_dict(orient="records"),
-            "cash_flow": self.cash_flow.to_dict(orient="records"),
+            "income_statement": _frame_to_records(self.income_statement),
+            "balance_sheet": _frame_to_records(self.balance_sheet),
+            "cash_flow": _frame_to_records(self.cash_flow),
             "dcf_valuation": dcf_results,
             "trading_comps_valuation": comps_results,
             "lbo_valuation": lbo_results,
             "capital_structure_grid": cap_structure_results
         }
+
+        if cache_key is not None:
+            cached_build = {
+                "results": results, # Encoded right away, so later changes by the caller are not cached
+                "columns": {
+                    "income_statement": list(self.income_statement.columns),
+                    "balance_sheet": list(self.balance_sheet.columns),
+                    "cash_flow": list(self.cash_flow.columns)
+                }
+            }
+            _store_cached_build(cache_key, cached_build)
         return results
+
+    def _build_model_cache_key(self, assumptions: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+        """
+        Key identifying a build_model call: the ticker, horizon, company data and assumptions.
+
+        Args:
+            assumptions: Assumptions passed to build_model
+
+        Returns:
+            Hashable cache key, or None when the inputs cannot be fingerprinted (the build is then not cached)
+        """
+        if self._company_data_fingerprint is None:
+            return None
+        try:
+            frozen_assumptions = _freeze_assumption(assumptions)
+            hash(frozen_assumptions)
+        except (TypeError, ValueError):
+            return None
+        return (
+            self.ticker,
+            self.forecast_years,
+            self._get_forecast_period_years()[0], # Depends on the current year when there is no history
+            (self.historical_growth_rate, self.historical_gross_margin, self.historical_ebitda_margin),
+            self._company_data_fingerprint,
+            _DEFAULTS_DIGEST,
+            frozen_assumptions
+        )
     
+    def _fingerprint_company_data(self) -> Optional[str]:
+        """Digest of the raw company data for build_model cache keys, None if it cannot be serialized."""
+        try:
+            company_data_payload = json.dumps(self.company_data, sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            return None
+        return hashlib.blake2b(company_data_payload.encode(), digest_size=16).hexdigest()
+    
+    def build_model_batch(self, assumptions_batch: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Project the income statement and cash flow for many assumption scenarios at once.
+
+        Intended for Monte-Carlo and sensitivity sweeps: instead of calling build_model
+        once per trial, every scenario is projected in a single broadcast pass and the
+        results are returned as arrays rather than DataFrame records.
+
+        Args:
+            assumptions_batch: Assumptions keyed like build_model. Per-year assumptions
+                (revenue_growth_rates, gross_margins, ebitda_margins) may be shaped
+                (num_scenarios, num_years); scalar assumptions (tax_rate,
+                depreciation_percent_revenue, interest_percent_operating_income,
+                discount_rate, receivable_days, inventory_days, payable_days,
+                capex_percent_revenue, debt_ratio) may be shaped (num_scenarios,).
+                Missing values fall back to the same defaults as build_model.
+
+        Returns:
+            Dictionary with the forecast "years", one (num_scenarios, forecast_periods)
+            array per income statement, cash flow and linked balance sheet line item
+            and the matching "discount_factors"
+        """
+        forecast_period_years = self._get_forecast_period_years()
+        num_forecast_periods = len(forecast_period_years)
+
+        growth_rates = self._resolve_batch_rates(assumptions_batch.get("revenue_growth_rates"), self.historical_growth_rate, num_forecast_periods)
+        gross_margins = self._resolve_batch_rates(assumptions_batch.get("gross_margins"), self.historical_gross_margin, num_forecast_periods)
+        ebitda_margins = self._resolve_batch_rates(assumptions_batch.get("ebitda_margins"), self.historical_ebitda_margin, num_forecast_periods)
+
+        tax_rate = self._resolve_batch_scalar(assumptions_batch.get("tax_rate"), _DEFAULTS.tax_rate)
+        depreciation_percent_revenue = self._resolve_batch_scalar(assumptions_batch.get("depreciation_percent_revenue"), _DEFAULTS.depreciation_percent_revenue)
+        interest_percent_operating_income = self._resolve_batch_scalar(assumptions_batch.get("interest_percent_operating_income", 0.10), _DEFAULTS.interest_percent_operating_income)
+        discount_rate = self._resolve_batch_scalar(assumptions_batch.get("discount_rate"), _DEFAULTS.discount_rate)
+        receivable_days = self._resolve_batch_scalar(assumptions_batch.get("receivable_days"), _DEFAULTS.receivable_days)
+        inventory_days = self._resolve_batch_scalar(assumptions_batch.get("inventory_days"), _DEFAULTS.inventory_days)
+        payable_days = self._resolve_batch_scalar(assumptions_batch.get("payable_days"), _DEFAULTS.payable_days)
+        capex_percent_revenue = self._resolve_batch_scalar(assumptions_batch.get("capex_percent_revenue"), _DEFAULTS.capex_percent_revenue)
+        base_fixed_assets_revenue_multiple = assumptions_batch.get("base_fixed_assets_revenue_multiple")
+        if base_fixed_assets_revenue_multiple is None: base_fixed_assets_revenue_multiple = _DEFAULTS.base_fixed_assets_revenue_multiple
+        # `debt_ratio` is a percentage as in build_model
+        debt_ratio = assumptions_batch.get("debt_ratio")
+        if debt_ratio is None:
+            target_debt_to_assets_ratio = self._resolve_batch_scalar(None, _DEFAULTS.target_debt_to_assets_ratio)
+        else:
+            target_debt_to_assets_ratio = self._resolve_batch_scalar(debt_ratio, 0.0) / 100.0
+
+        projected_is = project_income_statement_arrays(
+            self._get_base_revenue(),
+            growth_rates,
+            gross_margins,
+            ebitda_margins,
+            tax_rate,
+            depreciation_percent_revenue,
+            interest_percent_operating_income
+        )
+
+        # Working capital as the balance sheet projects it, then the change against the prior year
+        # (the latest historical balance sheet for the first forecast year, no change without history)
+        revenue = projected_is["revenue"]
+        cogs = revenue - projected_is["gross_profit"]
+        net_working_capital = revenue * (receivable_days / 365) + cogs * (inventory_days / 365) - cogs * (payable_days / 365)
+        if self.num_historical_periods > 0:
+            prior_net_working_capital = self._latest_historical_balance("net_working_capital")
+        else:
+            prior_net_working_capital = net_working_capital[..., :1]
+        change_in_working_capital = -np.diff(net_working_capital, axis=-1, prepend=prior_net_working_capital)
+
+        # Fixed assets carried in from history apply to the first forecast year only, as in _project_cash_flow
+        prior_fixed_assets = np.zeros(num_forecast_periods)
+        initial_fixed_assets = None
+        if self.num_historical_periods > 0:
+            prior_fixed_assets[:1] = self._latest_historical_balance("fixed_assets")
+        elif num_forecast_periods:
+            initial_fixed_assets = revenue[..., 0] * base_fixed_assets_revenue_multiple
+
+        projected_cf = project_cash_flow_arrays(
+            revenue,
+            projected_is["net_income"],
+            projected_is["depreciation"],
+            change_in_working_capital,
+            net_working_capital,
+            prior_fixed_assets,
+            capex_percent_revenue,
+            target_debt_to_assets_ratio,
+            initial_fixed_assets
+        )
+
+        # Broadcast every line item to a full (num_scenarios, forecast_periods) matrix
+        num_scenarios = max(arr.shape[0] for arr in (
+            growth_rates, gross_margins, ebitda_margins, tax_rate,
+            depreciation_percent_revenue, interest_percent_operating_income, discount_rate,
+            receivable_days, inventory_days, payable_days, capex_percent_revenue, target_debt_to_assets_ratio
+        ))
+        batch_shape = (num_scenarios, num_forecast_periods)
+        results = {name: np.broadcast_to(values, batch_shape) for name, values in projected_is.items()}
+        results["net_working_capital"] = np.broadcast_to(net_working_capital, batch_shape)
+        results["change_in_working_capital"] = np.broadcast_to(change_in_working_capital, batch_shape)
+        results.update({name: np.broadcast_to(values, batch_shape) for name, values in projected_cf.items()})
+
+        # Discounting a (num_scenarios, forecast_periods) cash flow matrix is then a row-wise product with these factors
+        periods = np.arange(1, num_forecast_periods + 1)
+        results["discount_factors"] = np.broadcast_to((1 + discount_rate) ** -periods, batch_shape)
+        results["years"] = np.asarray(forecast_period_years)
+        return results
+
+    @staticmethod
+    def _resolve_batch_rates(values: Any, fallback: float, num_periods: int) -> np.ndarray:
+        """Pad per-year batch assumptions to (num_scenarios, num_periods), filling missing years with the fallback."""
+        supplied = np.atleast_2d(np.asarray(values if values is not None else [], dtype=np.float64))
+        resolved = np.full((supplied.shape[0], num_periods), fallback, dtype=np.float64)
+        num_supplied = min(num_periods, supplied.shape[1])
+        resolved[:, :num_supplied] = supplied[:, :num_supplied]
+        return resolved
+
+    @staticmethod
+    def _resolve_batch_scalar(value: Any, default: float) -> np.ndarray:
+        """Shape a scalar or per-scenario batch assumption as a (num_scenarios, 1) column."""
+        return np.asarray(value if value is not None else default, dtype=np.float64).reshape(-1, 1)
+
+    def _latest_historical_balance(self, column: str) -> float:
+        """Latest historical balance sheet value of a column, read as _project_balance_sheet reads it (0 if missing)."""
+        if self.num_historical_periods == 0:
+            return 0.0
+        return float(self._get_historical_balance_sheet()[column].iat[self.num_historical_periods - 1])
+
+    def _get_historical_balance_sheet(self) -> pd.DataFrame:
+        """
+        Historical balance sheet rows with canonical column names, numeric and zero-filled.
+
+        Depends only on historical data, so the renamed block is built once per model and reused
+        by later build_model / build_model_batch calls; callers must copy before modifying it.
+        """
+        if self._historical_balance_sheet is None:
+            historical_bs_df = self.historical_statements_df.rename(columns={
+                "propertyPlantEquipmentNet": "fixed_assets", # Example, adjust to actual keys
+                "totalLiabilities": "total_debt" # Simplified, needs review
+            })
+            # Ensure all target columns are present
+            for col in BALANCE_SHEET_COLUMNS:
+                if col not in historical_bs_df.columns and col not in ["year", "is_historical"]:
+                    historical_bs_df[col] = 0.0
+            historical_bs = historical_bs_df[BALANCE_SHEET_COLUMNS].copy()
+            # Coerce and zero-fill the historical items in one pass; forecast rows are computed as floats
+            _coerce_numeric_columns(historical_bs, BALANCE_SHEET_COLUMNS[2:])
+            self._historical_balance_sheet = historical_bs
+        return self._historical_balance_sheet
+
+    def _get_forecast_period_years(self) -> List[int]:
+        """Forecast years following the latest historical year, including the terminal year."""
+        last_hist_year = self.latest_historical_year if self.latest_historical_year is not None else datetime.utcnow().year
+        return [last_hist_year + 1 + i for i in range(self.forecast_years + 1)] # +1 for terminal year/calculations
+
+    def _get_base_revenue(self) -> float:
+        """Revenue of the latest historical period, the starting point for revenue projections."""
+        if self.num_historical_periods > 0:
+            return self.latest_revenue
+
+        # No historical data
+        base_revenue = self.latest_income.get("revenue", 0) # Fallback, though latest_income might be {}
+        if not base_revenue: # Further fallback for true cold start
+            # Attempt to get a very old revenue figure or default to a placeholder
+            if self.company_data.get("income_statements"):
+                first_available_statement = self.company_data["income_statements"][0]
+                base_revenue = first_available_statement.get("revenue", 1_000_000) # Placeholder if absolutely no data
+            else:
+                base_revenue = 1_000_000 # Absolute fallback
+        return base_revenue
+
     def _project_income_statement(
         self, 
         growth_rates: List[float], 
@@ -351,108 +959,83 @@ class ThreeStatementModel:
         interest_percent_operating_income: float
     ):
         """Project the income statement, combining historical and forecast periods."""
-        # Add this print:
-        print(f"[_project_income_statement] Received growth_rates: {growth_rates}, gross_margins: {gross_margins}, ebitda_margins: {ebitda_margins}")
+        # Trace the raw per-year assumptions (debug level)
+        logger.debug("[_project_income_statement] Received growth_rates: %s, gross_margins: %s, ebitda_margins: %s", growth_rates, gross_margins, ebitda_margins)
 
         # Initialize with historical data if available
         if self.num_historical_periods > 0:
-            # Select relevant IS columns from historical_statements_df
-            # Ensure all expected columns exist, fill with 0 or NaN if not
-            is_cols = ["year", "is_historical", "revenue", "grossProfit", "ebitda", "depreciation", 
-                       "operatingIncome", "interestExpense", "incomeBeforeTax", "taxes", "netIncome"]
-            # Rename for consistency if needed, e.g., grossProfit -> gross_profit
-            historical_is_df = self.historical_statements_df.rename(columns={
-                "grossProfit": "gross_profit",
-                "operatingIncome": "operating_income",
-                "interestExpense": "interest_expense",
-                "incomeBeforeTax": "income_before_tax",
-                "netIncome": "net_income"
-            })
-            
-            # Ensure all target columns are present
-            for col in ["revenue", "gross_profit", "ebitda", "depreciation", "operating_income", 
-                        "interest_expense", "income_before_tax", "taxes", "net_income"]:
-                if col not in historical_is_df.columns:
-                    historical_is_df[col] = 0.0 # Or np.nan
-
-            self.income_statement = historical_is_df[["year", "is_historical", "revenue", "gross_profit", "ebitda", 
-                                                      "depreciation", "operating_income", "interest_expense", 
-                                                      "income_before_tax", "taxes", "net_income"]].copy()
+            # The renamed, zero-filled historical block depends only on historical data, so it is built
+            # once per model and reused by later build_model calls
+            if self._historical_income_statement is None:
+                # Rename for consistency if needed, e.g., grossProfit -> gross_profit
+                historical_is_df = self.historical_statements_df.rename(columns={
+                    "grossProfit": "gross_profit",
+                    "operatingIncome": "operating_income",
+                    "interestExpense": "interest_expense",
+                    "incomeBeforeTax": "income_before_tax",
+                    "netIncome": "net_income"
+                })
+                
+                # Ensure all target columns are present
+                for col in INCOME_STATEMENT_COLUMNS[2:]:
+                    if col not in historical_is_df.columns:
+                        historical_is_df[col] = 0.0 # Or np.nan
+
+                historical_is = historical_is_df[INCOME_STATEMENT_COLUMNS].copy()
+                # Coerce and zero-fill the historical items in one pass; forecast items are built as float arrays
+                _coerce_numeric_columns(historical_is, INCOME_STATEMENT_COLUMNS[2:])
+                self._historical_income_statement = historical_is
+            # Forecast rows are appended into a new frame, so the cached block is only copied when none are added
+            self.income_statement = self._historical_income_statement
         else:
-            self.income_statement = pd.DataFrame(columns=["year", "is_historical", "revenue", "gross_profit", "ebitda", 
-                                                          "depreciation", "operating_income", "interest_expense", 
-                                                          "income_before_tax", "taxes", "net_income"])
+            self.income_statement = pd.DataFrame(columns=INCOME_STATEMENT_COLUMNS)
 
         # Determine forecast years
-        forecast_period_years = []
-        last_hist_year = self.latest_historical_year if self.latest_historical_year is not None else datetime.utcnow().year
-        
-        for i in range(self.forecast_years + 1): # +1 for terminal year/calculations
-            forecast_period_years.append(last_hist_year + 1 + i)
-
-        forecast_df_list = []
+        forecast_period_years = self._get_forecast_period_years()
 
         # Base revenue for projections
-        if not self.income_statement.empty and "revenue" in self.income_statement.columns:
-            base_revenue = self.income_statement["revenue"].iloc[-1] if self.num_historical_periods > 0 else 0
-        else: # No historical data, or revenue column missing
-            base_revenue = self.latest_income.get("revenue", 0) # Fallback, though latest_income might be {}
-            if not base_revenue and self.num_historical_periods == 0: # Further fallback for true cold start
-                 # Attempt to get a very old revenue figure or default to a placeholder
-                 if self.company_data.get("income_statements"):
-                     first_available_statement = self.company_data["income_statements"][0]
-                     base_revenue = first_available_statement.get("revenue", 1_000_000) # Placeholder if absolutely no data
-                 else:
-                     base_revenue = 1_000_000 # Absolute fallback
-
-        # Project items for forecast years
-        current_revenue = base_revenue
-        
+        base_revenue = self._get_base_revenue()
+
         # Directly use passed-in resolved assumption values
         # depreciation_percent_revenue = assumptions.get("depreciation_percent_revenue", config.default_assumptions.get("depreciation_percent_revenue", 0.05))
         # interest_percent_operating_income = assumptions.get("interest_percent_operating_income", config.default_assumptions.get("interest_percent_operating_income", 0.10))
         # effective_tax_rate = assumptions.get("tax_rate", config.default_assumptions.get("tax_rate", 0.21))
 
-        for i, year_val in enumerate(forecast_period_years):
-            period_data = {"year": year_val, "is_historical": False}
-            
-            # Project revenue
-            growth_rate = growth_rates[i] if i < len(growth_rates) else self.historical_growth_rate
-            print(f"[_project_income_statement] Year {year_val} (idx {i}): Using growth_rate: {growth_rate}. From array: {i < len(growth_rates)}. Array val: {growth_rates[i] if i < len(growth_rates) else 'N/A'}. Historical: {self.historical_growth_rate}")
-            current_revenue = current_revenue * (1 + growth_rate)
-            period_data["revenue"] = current_revenue
-            
-            # Project gross profit
-            gp_margin = gross_margins[i] if i < len(gross_margins) else self.historical_gross_margin
-            print(f"[_project_income_statement] Year {year_val} (idx {i}): Using gp_margin: {gp_margin}. From array: {i < len(gross_margins)}. Array val: {gross_margins[i] if i < len(gross_margins) else 'N/A'}. Historical: {self.historical_gross_margin}")
-            period_data["gross_profit"] = current_revenue * gp_margin
-            
-            # Project EBITDA
-            ebitda_m = ebitda_margins[i] if i < len(ebitda_margins) else self.historical_ebitda_margin
-            print(f"[_project_income_statement] Year {year_val} (idx {i}): Using ebitda_margin: {ebitda_m}. From array: {i < len(ebitda_margins)}. Array val: {ebitda_margins[i] if i < len(ebitda_margins) else 'N/A'}. Historical: {self.historical_ebitda_margin}")
-            period_data["ebitda"] = current_revenue * ebitda_m
-            
-            # Project depreciation
-            period_data["depreciation"] = period_data["revenue"] * depreciation_percent_revenue # USE RESOLVED
-            period_data["operating_income"] = period_data["ebitda"] - period_data["depreciation"]
-            period_data["interest_expense"] = period_data["operating_income"] * interest_percent_operating_income # USE RESOLVED (Note: placeholder logic for interest)
-            period_data["income_before_tax"] = period_data["operating_income"] - period_data["interest_expense"]
-            period_data["taxes"] = period_data["income_before_tax"] * effective_tax_rate # USE RESOLVED
-            period_data["net_income"] = period_data["income_before_tax"] - period_data["taxes"]
-            
-            forecast_df_list.append(period_data)
-        
-        if forecast_df_list:
-            forecast_is_df = pd.DataFrame(forecast_df_list)
-            self.income_statement = pd.concat([self.income_statement, forecast_is_df], ignore_index=True)
-        
-        # Ensure all columns are numeric, fill NaNs
-        for col in ["revenue", "gross_profit", "ebitda", "depreciation", "operating_income", 
-                    "interest_expense", "income_before_tax", "taxes", "net_income"]:
-            if col in self.income_statement.columns:
-                self.income_statement[col] = pd.to_numeric(self.income_statement[col], errors='coerce').fillna(0)
-            else:
-                self.income_statement[col] = 0.0
+        # Resolve per-year rates, falling back to historical metrics beyond the supplied assumptions
+        num_forecast_periods = len(forecast_period_years)
+        resolved_growth_rates = self._resolve_batch_rates(growth_rates, self.historical_growth_rate, num_forecast_periods)[0]
+        resolved_gross_margins = self._resolve_batch_rates(gross_margins, self.historical_gross_margin, num_forecast_periods)[0]
+        resolved_ebitda_margins = self._resolve_batch_rates(ebitda_margins, self.historical_ebitda_margin, num_forecast_periods)[0]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[_project_income_statement] Years %s: using growth_rates %s, gp_margins %s, ebitda_margins %s "
+                "(assumptions supplied for the first %s/%s/%s years; historical: %s, %s, %s)",
+                forecast_period_years, resolved_growth_rates.tolist(), resolved_gross_margins.tolist(),
+                resolved_ebitda_margins.tolist(), len(growth_rates), len(gross_margins), len(ebitda_margins),
+                self.historical_growth_rate, self.historical_gross_margin, self.historical_ebitda_margin
+            )
+
+        projected_is = project_income_statement_arrays(
+            base_revenue,
+            resolved_growth_rates,
+            resolved_gross_margins,
+            resolved_ebitda_margins,
+            effective_tax_rate, # USE RESOLVED
+            depreciation_percent_revenue, # USE RESOLVED
+            interest_percent_operating_income # USE RESOLVED (Note: placeholder logic for interest)
+        )
+
+        if num_forecast_periods:
+            forecast_columns = {
+                "year": np.asarray(forecast_period_years),
+                "is_historical": np.zeros(num_forecast_periods, dtype=bool),
+                **projected_is
+            }
+            self.income_statement = _append_forecast_rows(
+                self.income_statement if self.num_historical_periods > 0 else None, forecast_columns
+            )
+        elif self.num_historical_periods > 0:
+            self.income_statement = self.income_statement.copy()
     
     def _project_balance_sheet(
         self,
@@ -464,278 +1047,267 @@ class ThreeStatementModel:
         resolved_debt_ratio_for_bs: float 
     ): 
         """Project the balance sheet, combining historical and forecast periods."""
-        bs_cols = ["year", "is_historical", "accounts_receivable", "inventory", "net_working_capital", 
-                   "fixed_assets", "total_assets", "accounts_payable", "total_debt", "total_equity"]
-
         if self.num_historical_periods > 0:
-            historical_bs_df = self.historical_statements_df.rename(columns={
-                "propertyPlantEquipmentNet": "fixed_assets", # Example, adjust to actual keys
-                "totalLiabilities": "total_debt" # Simplified, needs review
-            })
-            # Ensure all target columns are present
-            for col in bs_cols:
-                if col not in historical_bs_df.columns and col not in ["year", "is_historical"]:
-                    historical_bs_df[col] = 0.0
-            self.balance_sheet = historical_bs_df[bs_cols].copy()
+            # Copied below only if no forecast rows are appended (appending builds a new frame)
+            self.balance_sheet = self._get_historical_balance_sheet()
         else:
-            self.balance_sheet = pd.DataFrame(columns=bs_cols)
+            self.balance_sheet = pd.DataFrame(columns=BALANCE_SHEET_COLUMNS)
 
-        forecast_df_list = []
-        
-        for index, is_period_row in self.income_statement.iterrows():
-            year_val = is_period_row["year"]
-            is_hist = is_period_row["is_historical"]
-
-            if is_hist:
-                if index < len(self.balance_sheet) and self.balance_sheet.loc[index, "year"] == year_val:
-                    continue # Already populated
-                else: # Attempt to find matching year if alignment issues
-                    matching_hist_bs = self.historical_statements_df[self.historical_statements_df["year"] == year_val]
-                    if not matching_hist_bs.empty:
-                        # This part is tricky if self.balance_sheet isn't pre-populated correctly.
-                        # For now, we assume self.balance_sheet is populated with historicals already.
-                        pass # Data should be there
-                    else: # No matching historical BS for this IS year - problematic
-                        # Create a mostly empty row to avoid errors downstream
-                        forecast_df_list.append({"year": year_val, "is_historical": True, **{k: 0.0 for k in bs_cols if k not in ["year", "is_historical"]}})
-                        continue
-            else: # Forecast period
-                period_data = {"year": year_val, "is_historical": False}
-                revenue_forecast = is_period_row["revenue"]
-                gross_profit_forecast = is_period_row["gross_profit"]
-                cogs_forecast = revenue_forecast - gross_profit_forecast
-
-                period_data["accounts_receivable"] = revenue_forecast * (receivable_days / 365)
-                period_data["inventory"] = cogs_forecast * (inventory_days / 365)
-                period_data["accounts_payable"] = cogs_forecast * (payable_days / 365)
-                
-                period_data["net_working_capital"] = (
-                    period_data["accounts_receivable"] + 
-                    period_data["inventory"] - 
-                    period_data["accounts_payable"]
-                )
-                
-                # Fixed Assets: Base + CapEx - Depreciation
-                # This needs to be iterative, using previous period's fixed assets
-                if not forecast_df_list and self.num_historical_periods > 0 and "fixed_assets" in self.balance_sheet.columns:
-                    last_hist_fixed_assets = self.balance_sheet["fixed_assets"].iloc[self.num_historical_periods -1] if self.num_historical_periods > 0 else 0
-                elif forecast_df_list:
-                    last_hist_fixed_assets = forecast_df_list[-1]["fixed_assets"]
-                else: 
-                    last_hist_fixed_assets = revenue_forecast * base_fixed_assets_revenue_multiple 
-                
-                depreciation_current_period = self.income_statement.loc[self.income_statement['year'] == year_val, 'depreciation'].values[0]
-                capex_current_period = revenue_forecast * capex_percent_revenue 
-                period_data["fixed_assets"] = last_hist_fixed_assets + capex_current_period - depreciation_current_period
-
-                period_data["total_assets"] = (
-                    period_data["accounts_receivable"] + 
-                    period_data["inventory"] + 
-                    period_data["fixed_assets"]
-                )
-                
-                period_data["total_debt"] = period_data["total_assets"] * resolved_debt_ratio_for_bs 
-                period_data["total_equity"] = period_data["total_assets"] - period_data["total_debt"] - period_data["accounts_payable"]
+        # Forecast periods of the income statement as aligned arrays; historical IS and BS rows both
+        # come from historical_statements_df, so only forecast years need projecting
+        forecast_is = self.income_statement[~self.income_statement["is_historical"].to_numpy(dtype=bool)]
+        revenue_forecast = forecast_is["revenue"].to_numpy(dtype=np.float64)
+        depreciation_forecast = forecast_is["depreciation"].to_numpy(dtype=np.float64)
+        cogs_forecast = revenue_forecast - forecast_is["gross_profit"].to_numpy(dtype=np.float64)
 
-                forecast_df_list.append(period_data)
-        
-        if forecast_df_list:
-            forecast_bs_df = pd.DataFrame(forecast_df_list)
+        accounts_receivable = revenue_forecast * (receivable_days / 365)
+        inventory = cogs_forecast * (inventory_days / 365)
+        accounts_payable = cogs_forecast * (payable_days / 365)
+        net_working_capital = accounts_receivable + inventory - accounts_payable
+
+        # Fixed Assets: Base + CapEx - Depreciation
+        # Each period builds on the previous one, so the recurrence is a running sum seeded from the
+        # last historical fixed assets (or revenue-based fixed assets when there is no history)
+        if len(revenue_forecast):
             if self.num_historical_periods > 0:
-                forecast_bs_df_to_append = forecast_bs_df[~forecast_bs_df['year'].isin(self.balance_sheet['year'])]
-                self.balance_sheet = pd.concat([self.balance_sheet, forecast_bs_df_to_append], ignore_index=True)
-            else: 
-                self.balance_sheet = forecast_bs_df
+                base_fixed_assets = self.balance_sheet["fixed_assets"].iloc[self.num_historical_periods - 1]
+            else:
+                base_fixed_assets = revenue_forecast[0] * base_fixed_assets_revenue_multiple
+            fixed_assets = base_fixed_assets + np.cumsum(revenue_forecast * capex_percent_revenue - depreciation_forecast)
+        else:
+            fixed_assets = np.empty(0)
+
+        total_assets = accounts_receivable + inventory + fixed_assets
+        total_debt = total_assets * resolved_debt_ratio_for_bs
+        total_equity = total_assets - total_debt - accounts_payable
+
+        if len(revenue_forecast):
+            # Forecast years all follow the latest historical year, so they can be appended as-is
+            forecast_columns = {
+                "year": forecast_is["year"].to_numpy(),
+                "is_historical": np.zeros(len(revenue_forecast), dtype=bool),
+                "accounts_receivable": accounts_receivable,
+                "inventory": inventory,
+                "accounts_payable": accounts_payable,
+                "net_working_capital": net_working_capital,
+                "fixed_assets": fixed_assets,
+                "total_assets": total_assets,
+                "total_debt": total_debt,
+                "total_equity": total_equity
+            }
+            self.balance_sheet = _append_forecast_rows(
+                self.balance_sheet if self.num_historical_periods > 0 else None, forecast_columns
+            )
+        elif self.num_historical_periods > 0:
+            self.balance_sheet = self.balance_sheet.copy()
         
-        # Iterative updates after initial forecast_df_list is populated and self.balance_sheet is formed
+        # Iterative updates after the forecast rows are appended and self.balance_sheet is formed
         # This section updates BS based on CF, and might have the other uses of target_debt_to_assets_ratio
-        for index, global_period_row in self.income_statement.iterrows():
-            year_val = global_period_row["year"]
-            is_hist = global_period_row["is_historical"]
-            if is_hist: continue # Only for forecast periods
-
-            bs_indices = self.balance_sheet[self.balance_sheet["year"] == year_val].index
-            if not bs_indices.empty:
-                idx = bs_indices[0]
-                current_bs_row = self.balance_sheet.loc[idx]
-
-                # This block is for all forecast periods AFTER the first one in the iterative refinement
-                if index > self.num_historical_periods or (self.num_historical_periods == 0 and index > 0):
-                    # ... (fixed asset updates using capex/depreciation from CF would happen here or in CF projection)
-                    # Re-calculate total_assets if fixed_assets changed
-                    self.balance_sheet.loc[idx, "total_assets"] = (
-                        current_bs_row["net_working_capital"] + # Or current_bs_row["accounts_receivable"] + current_bs_row["inventory"]
-                        current_bs_row["fixed_assets"] 
-                        # Potentially add other current assets if modeled explicitly
-                    )
-                    total_assets_updated = self.balance_sheet.loc[idx, "total_assets"]
-                    # Ensure this uses the new parameter name
-                    self.balance_sheet.loc[idx, "total_debt"] = total_assets_updated * resolved_debt_ratio_for_bs
-                    self.balance_sheet.loc[idx, "total_equity"] = total_assets_updated - self.balance_sheet.loc[idx, "total_debt"] - current_bs_row["accounts_payable"]
-                elif self.num_historical_periods == 0 and index == 0: # Very first period of a no-history model
-                    # This was handled in the initial loop, but ensure consistency if re-evaluating total_debt
-                    total_assets_current_period = self.balance_sheet.loc[idx, "total_assets"]
-                    # Ensure this uses the new parameter name
-                    self.balance_sheet.loc[idx, "total_debt"] = total_assets_current_period * resolved_debt_ratio_for_bs
-                    self.balance_sheet.loc[idx, "total_equity"] = total_assets_current_period - self.balance_sheet.loc[idx, "total_debt"] - self.balance_sheet.loc[idx, "accounts_payable"]
-
-        for col in bs_cols:
-            if col not in ["year", "is_historical"]: 
-                 if col in self.balance_sheet.columns:
-                    self.balance_sheet[col] = pd.to_numeric(self.balance_sheet[col], errors='coerce').fillna(0)
-                 else:
-                    self.balance_sheet[col] = 0.0
+        # Only forecast periods are refined; their balance sheet rows are resolved in one lookup and
+        # the totals are recomputed for all of them at once on plain float arrays
+        forecast_rows = np.flatnonzero(~self.income_statement["is_historical"].to_numpy(dtype=bool))
+        forecast_bs_pos = self._balance_sheet_positions(self.income_statement["year"].to_numpy()[forecast_rows])
+        has_bs_row = forecast_bs_pos >= 0
+        # All forecast periods AFTER the first one re-total assets (fixed assets may have changed); the very
+        # first period of a no-history model keeps its total assets and only re-derives debt and equity
+        retotal_pos = forecast_bs_pos[has_bs_row & (forecast_rows > self.num_historical_periods)]
+        if self.num_historical_periods == 0:
+            refresh_pos = forecast_bs_pos[has_bs_row]
+        else:
+            refresh_pos = retotal_pos
+
+        if len(refresh_pos):
+            net_working_capital = self.balance_sheet["net_working_capital"].to_numpy(dtype=np.float64)
+            fixed_assets = self.balance_sheet["fixed_assets"].to_numpy(dtype=np.float64)
+            accounts_payable = self.balance_sheet["accounts_payable"].to_numpy(dtype=np.float64)
+            total_assets = self.balance_sheet["total_assets"].to_numpy(dtype=np.float64, copy=True)
+            total_debt = self.balance_sheet["total_debt"].to_numpy(dtype=np.float64, copy=True)
+            total_equity = self.balance_sheet["total_equity"].to_numpy(dtype=np.float64, copy=True)
+
+            # Other current assets might be added here if modeled explicitly
+            total_assets[retotal_pos] = net_working_capital[retotal_pos] + fixed_assets[retotal_pos]
+            total_debt[refresh_pos] = total_assets[refresh_pos] * resolved_debt_ratio_for_bs
+            total_equity[refresh_pos] = total_assets[refresh_pos] - total_debt[refresh_pos] - accounts_payable[refresh_pos]
+
+            self.balance_sheet["total_assets"] = total_assets
+            self.balance_sheet["total_debt"] = total_debt
+            self.balance_sheet["total_equity"] = total_equity
     
-    def _project_cash_flow(self, capex_percent_revenue: float, resolved_debt_ratio_for_bs: float): 
-        """Project the cash flow statement, combining historical and forecast periods."""
+    def _balance_sheet_positions(self, query_years: np.ndarray) -> np.ndarray:
+        """
+        Resolve balance sheet row positions for many years in one vectorized lookup.
+
+        Args:
+            query_years: Years to look up
+
+        Returns:
+            Row position of each year in self.balance_sheet (the first row when a year repeats), -1 where missing
+        """
+        bs_years = self.balance_sheet["year"].to_numpy()
+        # Index.get_indexer needs unique labels, so index the first occurrence of each year
+        unique_years, first_positions = np.unique(bs_years, return_index=True)
+        positions = pd.Index(unique_years).get_indexer(np.asarray(query_years))
+        found = positions >= 0
+        positions[found] = first_positions[positions[found]]
+        return positions
+
+    def _project_cash_flow(
+        self,
+        capex_percent_revenue: float,
+        resolved_debt_ratio_for_bs: float,
+        base_fixed_assets_revenue_multiple: float,
+        dtype: Any = np.float64
+    ): 
+        """
+        Project the cash flow statement, combining historical and forecast periods.
+
+        Args:
+            capex_percent_revenue: Capital expenditure as a percentage of revenue
+            resolved_debt_ratio_for_bs: Target debt to total assets ratio
+            base_fixed_assets_revenue_multiple: Fixed assets to revenue multiple for a first period without history
+            dtype: Float dtype of the working arrays. Scenario/Monte-Carlo callers can pass np.float32 to
+                halve memory traffic; the resulting statements are stored as float64 either way.
+        """
         cf_cols = ["year", "is_historical", "net_income", "depreciation", "change_in_working_capital",
                    "operating_cash_flow", "capex", "free_cash_flow"]
 
         if self.num_historical_periods > 0:
-            historical_cf_df = self.historical_statements_df.rename(columns={
-                # Add renames if raw data keys differ from cf_cols
-                "changeInReceivables": "change_in_receivables", # Example
-                "changeInInventory": "change_in_inventory",   # Example
-                "capitalExpenditure": "capex"
-            }) 
-            # Calculate change_in_working_capital for historical if not directly available
-            if "change_in_working_capital" not in historical_cf_df.columns and "net_working_capital" in self.balance_sheet.columns:
-                historical_nwc = self.balance_sheet[self.balance_sheet["is_historical"]]["net_working_capital"].diff().fillna(0)
-                # The first period's diff will be NaN, fill with 0. The change is -(current - previous).
-                historical_cf_df["change_in_working_capital"] = -historical_nwc 
-            
-            for col in cf_cols:
-                if col not in historical_cf_df.columns and col not in ["year", "is_historical"]:
-                    historical_cf_df[col] = 0.0 # Or np.nan
-            self.cash_flow = historical_cf_df[cf_cols].copy()
+            # The historical block depends only on historical data, so it is built once per model
+            # and reused by later build_model calls (e.g. assumption sweeps over the same company)
+            if self._historical_cash_flow is None:
+                # Built column by column from historical_statements_df rather than renaming (copying) the
+                # whole merged frame and then slicing out cf_cols
+                historical_df = self.historical_statements_df
+                historical_cf_columns = {}
+                for col in cf_cols:
+                    # Raw data keys that differ from cf_cols
+                    source_col = "capitalExpenditure" if col == "capex" and "capitalExpenditure" in historical_df.columns else col
+                    if source_col in historical_df.columns:
+                        historical_cf_columns[col] = historical_df[source_col].to_numpy()
+                    elif col == "change_in_working_capital" and "net_working_capital" in self.balance_sheet.columns:
+                        # Calculate change_in_working_capital for historical if not directly available
+                        # Historical rows lead the balance sheet, so they are a positional slice rather than a mask
+                        historical_nwc = self.balance_sheet["net_working_capital"].iloc[:self.num_historical_periods].diff().fillna(0)
+                        # The first period's diff will be NaN, fill with 0. The change is -(current - previous).
+                        historical_cf_columns[col] = (-historical_nwc).reindex(historical_df.index).to_numpy()
+                    else:
+                        historical_cf_columns[col] = np.zeros(len(historical_df)) # Or np.nan
+                historical_cf = pd.DataFrame(historical_cf_columns, index=historical_df.index)
+                # Coerce and zero-fill the historical items in one pass; forecast rows are computed as floats
+                _coerce_numeric_columns(historical_cf, cf_cols[2:])
+                self._historical_cash_flow = historical_cf
+            # Copied below only if no rows are added (adding rows builds a new frame)
+            self.cash_flow = self._historical_cash_flow
         else:
             self.cash_flow = pd.DataFrame(columns=cf_cols)
 
-        forecast_df_list = []
-
-        # Iterate through each period in the income_statement (which includes all historical and forecast years)
-        for index, global_period_row in self.income_statement.iterrows():
-            year_val = global_period_row["year"]
-            is_hist = global_period_row["is_historical"]
-
-            if is_hist:
-                if index < len(self.cash_flow) and self.cash_flow.loc[index, "year"] == year_val:
-                    continue # Already populated from historical_statements_df
-                else: # Should be populated, if not, implies missing historical CF data
-                    forecast_df_list.append({"year": year_val, "is_historical": True, **{k: 0.0 for k in cf_cols if k not in ["year", "is_historical"]}})
-                    continue 
-            else: # Forecast period
-                period_data = {"year": year_val, "is_historical": False}
-                
-                # Get corresponding IS and BS forecast rows
-                is_row = global_period_row # IS data for current forecast year
-                bs_row = self.balance_sheet[self.balance_sheet["year"] == year_val]
-                if bs_row.empty: # Should not happen if BS projection is complete
-                    # Add empty row to avoid crash, but log this issue
-                    print(f"Warning: Missing balance sheet data for forecast year {year_val} when projecting cash flow.")
-                    bs_row = pd.Series(index=self.balance_sheet.columns).fillna(0)
-                else:
-                    bs_row = bs_row.iloc[0]
-
-                period_data["net_income"] = is_row["net_income"]
-                period_data["depreciation"] = is_row["depreciation"]
-                
-                # Change in Working Capital for forecast periods
-                # NWC current period - NWC previous period
-                current_nwc = bs_row["net_working_capital"]
-                
-                # Find previous period's NWC (could be last historical or previous forecast)
-                prev_year_val = year_val - 1
-                prev_bs_row = self.balance_sheet[self.balance_sheet["year"] == prev_year_val]
-                
-                if not prev_bs_row.empty:
-                    prev_nwc = prev_bs_row.iloc[0]["net_working_capital"]
-                elif self.num_historical_periods > 0 and prev_year_val == self.latest_historical_year : # Last historical
-                     prev_nwc = self.balance_sheet[self.balance_sheet["year"] == prev_year_val].iloc[0]["net_working_capital"]
-                else: # Should ideally not happen if BS is fully populated
-                    prev_nwc = current_nwc # Assume no change if previous not found (or 0 for first period of all forecast)
-
-                period_data["change_in_working_capital"] = -(current_nwc - prev_nwc)
-                
-                period_data["operating_cash_flow"] = (
-                    period_data["net_income"] + 
-                    period_data["depreciation"] + 
-                    period_data["change_in_working_capital"]
-                )
-                
-                period_data["capex"] = -is_row["revenue"] * capex_percent_revenue # USE RESOLVED, ensure negative for outflow
-                
-                period_data["free_cash_flow"] = period_data["operating_cash_flow"] + period_data["capex"]
-                
-                forecast_df_list.append(period_data)
-
-                # Update Balance Sheet Fixed Assets based on this period's CapEx and Depreciation
-            # This is the iterative step linking Cash Flow and Balance Sheet
-            # Find the corresponding row in the balance sheet
-            bs_indices = self.balance_sheet[self.balance_sheet["year"] == year_val].index
-            if not bs_indices.empty:
-                idx = bs_indices[0]
-                
-                if index > 0: # Not first period
-                    prev_year_val = year_val - 1
-                    if self.num_historical_periods > 0 and prev_year_val == self.latest_historical_year:
-                        # Get last historical fixed assets
-                        prev_fa_series = self.balance_sheet.loc[self.balance_sheet['year'] == prev_year_val, 'fixed_assets']
-                        prev_fixed_assets = prev_fa_series.values[0] if not prev_fa_series.empty else 0
-                    else:
-                         prev_fixed_assets = 0
-                        
-                    self.balance_sheet.loc[idx, "fixed_assets"] = (
-                        prev_fixed_assets +
-                        period_data["capex"] +  # Already negative for outflow
-                        period_data["depreciation"] # Already negative for reduction
-                    )
-                    
-                    # Update total assets
-                    self.balance_sheet.loc[idx, "total_assets"] = (
-                        bs_row["net_working_capital"] +
-                        self.balance_sheet.loc[idx, "fixed_assets"] # Other current assets might be missing
-                    )
-                    
-                    # Update total debt and equity based on target debt ratio
-                    total_assets = self.balance_sheet.loc[idx, "total_assets"]
-                    self.balance_sheet.loc[idx, "total_debt"] = total_assets * resolved_debt_ratio_for_bs # Use new_param_name
-                    self.balance_sheet.loc[idx, "total_equity"] = total_assets - self.balance_sheet.loc[idx, "total_debt"]
-                else:
-                    # First forecast period - initialize based on revenue
-                    base_revenue_for_bs = is_row["revenue"]
-                    # base_fixed_assets_revenue_multiple is already a resolved parameter passed to this method
-                    # No need to call assumptions.get here.
-                    # base_fixed_assets_revenue_multiple = assumptions.get("base_fixed_assets_revenue_multiple", config.default_assumptions.get("base_fixed_assets_revenue_multiple", 0.70))
-                    current_fixed_assets = base_revenue_for_bs * base_fixed_assets_revenue_multiple
-                    self.balance_sheet.loc[idx, "fixed_assets"] = current_fixed_assets
-                    
-                    # Project forward based on growth was removed as it was using an undefined variable
-                    # and fixed assets should be driven by capex and depreciation primarily.
-                    # The iterative updates via _project_cash_flow handle this.
-                    
-                    # Update total assets for the first forecast period
-                    self.balance_sheet.loc[idx, "total_assets"] = (
-                        self.balance_sheet.loc[idx, "net_working_capital"] + # NWC for current year already calculated
-                        current_fixed_assets
-                    )
-                    
-                    # Update total debt and equity based on target ratio for the first forecast period
-                    total_assets_current_period = self.balance_sheet.loc[idx, "total_assets"]
-                    self.balance_sheet.loc[idx, "total_debt"] = total_assets_current_period * resolved_debt_ratio_for_bs # Use new_param_name
-                    self.balance_sheet.loc[idx, "total_equity"] = total_assets_current_period - self.balance_sheet.loc[idx, "total_debt"]
-
-        # Combine historical and forecast periods
-        if forecast_df_list:
-            forecast_df = pd.DataFrame(forecast_df_list)
-            if not self.cash_flow.empty:
-                self.cash_flow = pd.concat([self.cash_flow, forecast_df], ignore_index=True)
-            else:
-                self.cash_flow = forecast_df
+        # Balance sheet rows are resolved by year in bulk below rather than by a boolean mask per period,
+        # and the fields this pass reads and rewrites are held as plain float arrays
+        bs_soa = {
+            col: self.balance_sheet[col].to_numpy(dtype=dtype, copy=True)
+            for col in ("net_working_capital", "fixed_assets", "total_assets", "total_debt", "total_equity")
+        }
 
-        # Convert numeric columns to float and fill NaN with 0
-        for col in cf_cols:
-            if col not in ["year", "is_historical"] and col in self.cash_flow.columns:
-                self.cash_flow[col] = pd.to_numeric(self.cash_flow[col], errors='coerce').fillna(0)
-    
+        # Income statement columns, extracted once as aligned arrays
+        years = self.income_statement["year"].to_numpy()
+        is_hist_arr = self.income_statement["is_historical"].to_numpy(dtype=bool)
+        net_income_arr = self.income_statement["net_income"].to_numpy(dtype=dtype)
+        depreciation_arr = self.income_statement["depreciation"].to_numpy(dtype=dtype)
+        revenue_arr = self.income_statement["revenue"].to_numpy(dtype=dtype)
+        forecast_mask = ~is_hist_arr
+
+        # Net working capital per balance sheet year (first BS row per year), in year order
+        nwc_by_year = self.balance_sheet.drop_duplicates("year").set_index("year")["net_working_capital"].sort_index()
+        bs_years = nwc_by_year.index.to_numpy()
+        nwc_sorted = nwc_by_year.to_numpy(dtype=dtype)
+
+        # Year-over-year NWC change as a single diff; assume no change where the previous year is
+        # not on the balance sheet (e.g. the first period of all forecast)
+        nwc_change = np.diff(nwc_sorted, prepend=nwc_sorted[:1])
+        nwc_change[np.diff(bs_years, prepend=bs_years[:1] - 1) != 1] = 0.0
+
+        # Change in working capital for every period at once (only the forecast rows are kept)
+        change_in_wc_arr = -pd.Series(nwc_change, index=bs_years).reindex(years).to_numpy(dtype=dtype)
+        missing_bs = np.isnan(change_in_wc_arr)
+        for year_val in years[forecast_mask & missing_bs]: # Should not happen if BS projection is complete
+            logger.warning("Missing balance sheet data for forecast year %s when projecting cash flow.", year_val)
+        if missing_bs.any():
+            # Without a balance sheet row the current NWC counts as zero against the previous year's
+            change_in_wc_arr[missing_bs] = nwc_by_year.reindex(years[missing_bs] - 1).fillna(0).to_numpy(dtype=dtype)
+
+        # Historical years already in the cash flow statement; any others get zero rows
+        existing_cf_years = set(self.cash_flow["year"].tolist())
+        # Should be populated from historical_statements_df, if not, implies missing historical CF data
+        missing_hist_years = [year_val for year_val in years[is_hist_arr].tolist() if year_val not in existing_cf_years]
+
+        # Balance sheet row of each forecast period (-1 where missing)
+        forecast_years = years[forecast_mask]
+        forecast_bs_pos = self._balance_sheet_positions(forecast_years)
+        has_bs_row = forecast_bs_pos >= 0
+
+        # Fixed assets carried into each forecast period: the latest historical fixed assets for the period
+        # right after it, nothing otherwise (historical rows are never rewritten below)
+        latest_hist_year = self.latest_historical_year if self.num_historical_periods > 0 else None
+        latest_hist_fa_pos = self._balance_sheet_positions([latest_hist_year])[0] if latest_hist_year is not None else -1
+        prior_fixed_assets = np.zeros(len(forecast_years), dtype=dtype)
+        if latest_hist_fa_pos >= 0:
+            prior_fixed_assets[forecast_years - 1 == latest_hist_year] = bs_soa["fixed_assets"][latest_hist_fa_pos]
+
+        # A model that starts with a forecast period seeds that period's fixed assets from revenue
+        initial_fixed_assets = None
+        if len(years) and forecast_mask[0]:
+            initial_fixed_assets = revenue_arr[0] * base_fixed_assets_revenue_multiple
+
+        projected_cf = project_cash_flow_arrays(
+            revenue_arr[forecast_mask],
+            net_income_arr[forecast_mask],
+            depreciation_arr[forecast_mask],
+            change_in_wc_arr[forecast_mask],
+            np.where(has_bs_row, bs_soa["net_working_capital"][forecast_bs_pos], 0),
+            prior_fixed_assets,
+            capex_percent_revenue, # USE RESOLVED
+            float(resolved_debt_ratio_for_bs),
+            initial_fixed_assets
+        )
+
+        # Link fixed assets and the totals derived from them back into the balance sheet
+        for col in ("fixed_assets", "total_assets", "total_debt", "total_equity"):
+            bs_soa[col][forecast_bs_pos[has_bs_row]] = projected_cf[col][has_bs_row]
+
+        # Write the updated balance sheet fields back in one assignment per column
+        for col, values in bs_soa.items():
+            self.balance_sheet[col] = values.astype(np.float64, copy=False)
 
+        # Combine historical and forecast periods column by column into one frame; historical years
+        # missing CF data get zero rows between the two
+        num_missing_hist = len(missing_hist_years)
+        if num_missing_hist or forecast_mask.any():
+            forecast_columns = {
+                "net_income": net_income_arr[forecast_mask],
+                "depreciation": depreciation_arr[forecast_mask],
+                "change_in_working_capital": change_in_wc_arr[forecast_mask],
+                "operating_cash_flow": projected_cf["operating_cash_flow"],
+                "capex": projected_cf["capex"],
+                "free_cash_flow": projected_cf["free_cash_flow"]
+            }
+            zero_fill = np.zeros(num_missing_hist)
+            cash_flow_columns = {
+                "year": np.concatenate([
+                    self.cash_flow["year"].to_numpy(dtype=years.dtype),
+                    np.asarray(missing_hist_years, dtype=years.dtype),
+                    forecast_years
+                ]),
+                "is_historical": np.concatenate([
+                    self.cash_flow["is_historical"].to_numpy(dtype=bool),
+                    np.ones(num_missing_hist, dtype=bool),
+                    is_hist_arr[forecast_mask]
+                ])
+            }
+            for col, forecast_values in forecast_columns.items():
+                forecast_values[np.isnan(forecast_values)] = 0.0
+                cash_flow_columns[col] = np.concatenate([
+                    self.cash_flow[col].to_numpy(dtype=np.float64), zero_fill, forecast_values
+                ])
+            self.cash_flow = pd.DataFrame(cash_flow_columns, copy=False)
+        elif self.num_historical_periods > 0:
+            self.cash_flow = self.cash_flow.copy()
@@ -3,41 +3,41 @@ Request models for API validation.
 Uses Pydantic for data validation and conversion.
 """
 
-from typing import Dict, List, Optional, Any, Union
-from pydantic import BaseModel, Field, validator
-import re
+from typing import Annotated, Dict, List, Optional, Any, Union
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
 from enum import Enum
 from datetime import date
 
+# Ticker symbol: letters, numbers, and some special chars, always converted to uppercase.
+# Validated in pydantic-core rather than a Python validator; the pattern is checked before
+# the uppercase conversion, so it accepts either case.
+Ticker = Annotated[str, StringConstraints(to_upper=True, pattern=r'^[A-Za-z0-9.\-]+$')]
+
+# Margin as a fraction, between 0 and 1 (0% to 100%)
+Margin = Annotated[float, Field(ge=0, le=1)]
+
 class ExportType(str, Enum):
     EXCEL = "Excel"
     PPT = "PPT"
 
 class CompanyInfoRequest(BaseModel):
     """Request model for fetching company information"""
-    ticker: str = Field(..., description="Company stock ticker symbol")
-    
-    @validator('ticker')
-    def validate_ticker(cls, v):
-        """Validate ticker format"""
-        if not isinstance(v, str):
-            raise ValueError("Ticker must be a string")
-        
-        # Validate ticker format (uppercase letters, numbers, and some special chars)
-        if not re.match(r'^[A-Z0-9.\-]+$', v.upper()):
-            raise ValueError("Invalid ticker format")
-        
-        return v.upper()  # Always convert to uppercase
+    model_config = ConfigDict(frozen=True)
+
+    ticker: Ticker = Field(..., description="Company stock ticker symbol")
 
 class ModelAssumptionsRequest(BaseModel):
     """
     Request model for financial model assumptions.
     Used for both creating new models and updating existing ones.
     """
+    model_config = ConfigDict(frozen=True)
+
     # Growth assumptions
     revenue_growth_rates: List[float] = Field(
         ..., 
-        description="Annual revenue growth rates for the forecast period"
+        description="Annual revenue growth rates for the forecast period",
+        min_length=1
     )
     terminal_growth_rate: float = Field(
         ..., 
@@ -45,13 +45,15 @@ class ModelAssumptionsRequest(BaseModel):
     )
     
     # Margin assumptions
-    gross_margins: List[float] = Field(
+    gross_margins: List[Margin] = Field(
         ..., 
-        description="Gross margin forecasts"
+        description="Gross margin forecasts",
+        min_length=1
     )
-    ebitda_margins: List[float] = Field(
+    ebitda_margins: List[Margin] = Field(
         ..., 
-        description="EBITDA margin forecasts"
+        description="EBITDA margin forecasts",
+        min_length=1
     )
     
     # Working capital assumptions
@@ -120,27 +122,6 @@ class ModelAssumptionsRequest(BaseModel):
         None,
         description="Any additional custom assumptions"
     )
-    
-    # Validators
-    @validator('revenue_growth_rates')
-    def validate_growth_rates(cls, v):
-        """Validate growth rates"""
-        if not v or len(v) < 1:
-            raise ValueError("At least one growth rate is required")
-        return v
-    
-    @validator('gross_margins', 'ebitda_margins')
-    def validate_margins(cls, v):
-        """Validate margins"""
-        if not v or len(v) < 1:
-            raise ValueError("At least one margin value is required")
-            
-        # Check margins are between 0% and 100%
-        for margin in v:
-            if margin < 0 or margin > 1:
-                raise ValueError("Margins must be between 0 and 1 (0% to 100%)")
-        
-        return v
 
 class ExportRequest(BaseModel):
     model_id: str
@@ -149,23 +130,13 @@ class ExportRequest(BaseModel):
 
 class CreateModelRequest(BaseModel):
     """Request model for creating a new financial model"""
-    ticker: str = Field(..., description="Company stock ticker symbol")
+    model_config = ConfigDict(frozen=True)
+
+    ticker: Ticker = Field(..., description="Company stock ticker symbol")
     assumptions: ModelAssumptionsRequest = Field(
         ..., 
         description="Financial model assumptions"
     )
-    
-    @validator('ticker')
-    def validate_ticker(cls, v):
-        """Validate ticker format"""
-        if not isinstance(v, str):
-            raise ValueError("Ticker must be a string")
-        
-        # Validate ticker format (uppercase letters, numbers, and some special chars)
-        if not re.match(r'^[A-Z0-9.\-]+$', v.upper()):
-            raise ValueError("Invalid ticker format")
-        
-        return v.upper()  # Always convert to uppercase
 
 class UpdateModelRequest(BaseModel):
     """Request model for updating an existing financial model"""
@@ -2,11 +2,158 @@
 Valuation engine implementations for DCF, Trading Comps, and LBO.
 """
 
+import asyncio
+import logging
+import time
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Callable, Awaitable
+from collections import OrderedDict
 from data_providers.provider_factory import get_data_provider
 
+logger = logging.getLogger(__name__)
+
+# Profile keys that may hold shares outstanding directly, in lookup order
+_PROFILE_SHARES_KEYS = ("shareOutstanding", "sharesOutstanding")
+_MISSING = object()
+
+# Peer profiles and key metrics change at most daily, so successful lookups are kept per process for a
+# few hours and shared by every valuation that lists the same peers
+_PEER_DATA_TTL_SECONDS = 6 * 60 * 60
+_PEER_DATA_CACHE_SIZE = 512
+_peer_data_cache: "OrderedDict[Tuple[str, str, str], Tuple[float, Any]]" = OrderedDict()
+# Lookups currently being fetched, so concurrent valuations with overlapping peers share one provider call
+_peer_data_inflight: "Dict[Tuple[str, str, str], asyncio.Future]" = {}
+
+async def _cached_peer_batch(
+    provider: Any,
+    kind: str,
+    tickers: List[str],
+    fetch_many: Callable[[List[str]], Awaitable[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """
+    Return cached provider lookups for several peers, batch-fetching the ones missing or expired.
+    
+    Peers already being fetched by another caller are awaited instead of requested again.
+    
+    Args:
+        provider: Data provider the lookups go to (part of the cache key)
+        kind: Lookup name, e.g. "profile" or "key_metrics"
+        tickers: Peer tickers
+        fetch_many: Coroutine function taking the tickers to fetch and returning a ticker -> data dictionary
+        
+    Returns:
+        Dictionary mapping tickers to provider responses; tickers the provider did not return are
+        omitted and not cached
+    """
+    provider_name = type(provider).__name__
+    now = time.monotonic()
+    found = {}
+    missing = []
+    pending = {}
+    for ticker in tickers:
+        key = (provider_name, kind, ticker)
+        cached = _peer_data_cache.get(key)
+        if cached is not None and now - cached[0] < _PEER_DATA_TTL_SECONDS:
+            _peer_data_cache.move_to_end(key)
+            found[ticker] = cached[1]
+        elif key in _peer_data_inflight:
+            pending[ticker] = _peer_data_inflight[key]
+        elif ticker not in missing:
+            missing.append(ticker)
+    if missing:
+        loop = asyncio.get_running_loop()
+        futures = {}
+        for ticker in missing:
+            futures[ticker] = _peer_data_inflight[(provider_name, kind, ticker)] = loop.create_future()
+        fetched = {}
+        try:
+            fetched = await fetch_many(missing)
+        finally:
+            # Waiters see a failed fetch as a missing peer; the error itself is raised to this caller only
+            for ticker, future in futures.items():
+                del _peer_data_inflight[(provider_name, kind, ticker)]
+                if not future.done():
+                    future.set_result(fetched.get(ticker, _MISSING))
+        for ticker, data in fetched.items():
+            _peer_data_cache[(provider_name, kind, ticker)] = (now, data)
+            _peer_data_cache.move_to_end((provider_name, kind, ticker))
+            found[ticker] = data
+        while len(_peer_data_cache) > _PEER_DATA_CACHE_SIZE:
+            _peer_data_cache.popitem(last=False)
+    for ticker, future in pending.items():
+        # Shielded so a cancelled waiter does not cancel the shared result
+        data = await asyncio.shield(future)
+        if data is not _MISSING:
+            found[ticker] = data
+    return found
+
+# Trading comps fields and the provider key-metrics keys they are read from, in fallback order
+# (FMP specific field names, SEC might differ or not provide all)
+_PEER_METRIC_FIELDS = (
+    ("ev_to_ebitda", ("enterpriseValueOverEBITDA",)),
+    ("ev_to_revenue", ("evToSales", "enterpriseValueOverSales")),
+    ("price_to_earnings", ("peRatio", "priceEarningsRatio")),
+    ("debt_to_ebitda", ("debtToEbitda",)),
+)
+
+def _peer_metric(peer_metrics: Dict[str, Any], keys: Tuple[str, ...]) -> float:
+    """
+    Read one peer multiple from the first of its keys present in the metrics.
+    
+    Args:
+        peer_metrics: Peer key metrics
+        keys: Candidate keys in fallback order
+        
+    Returns:
+        Multiple as a float (0.0 if missing or empty)
+    """
+    for key in keys:
+        if key in peer_metrics:
+            value = peer_metrics[key]
+            return float(value) if value else 0.0
+    return 0.0
+
+def extract_shares_outstanding(company_data: Dict[str, Any]) -> float:
+    """
+    Get the latest shares outstanding from company data.
+    
+    Args:
+        company_data: Raw company data from API
+        
+    Returns:
+        Number of shares outstanding
+    """
+    # Extract shares outstanding from company profile
+    profile = company_data.get("profile", {})
+    
+    # Different APIs provide shares outstanding in different formats; the first source whose key is
+    # present wins. Each source is a single dict.get with a sentinel rather than an `in` test plus `[]`
+    price = profile.get("price")
+    
+    # Try FMP format
+    if "mktCap" in profile and price is not None and price > 0:
+        # Calculate from market cap and price
+        return max(1, float(profile["mktCap"] / price))
+    
+    # Try alternate fields that might contain shares data
+    for key in _PROFILE_SHARES_KEYS:
+        shares_outstanding = profile.get(key, _MISSING)
+        if shares_outstanding is not _MISSING:
+            return max(1, float(shares_outstanding))
+    
+    # Try key metrics if available
+    shares_outstanding = 0
+    metrics = company_data.get("key_metrics", _MISSING)
+    if isinstance(metrics, list) and len(metrics) > 0:
+        metrics = metrics[0]
+    if isinstance(metrics, dict):
+        shares_outstanding = metrics.get("sharesOutstanding", 0)
+    
+    # Ensure a valid positive number
+    return max(1, float(shares_outstanding))
+
+
 class DCFValuation:
     """Discounted Cash Flow valuation model"""
     
@@ -18,7 +165,8 @@ class DCFValuation:
         discount_rate: float,
         terminal_growth_rate: float,
         tax_rate: float,
-        company_data: Dict[str, Any]
+        company_data: Dict[str, Any],
+        shares_outstanding: Optional[float] = None
     ):
         """
         Initialize the DCF model.
@@ -31,6 +179,7 @@ class DCFValuation:
             terminal_growth_rate: Long-term growth rate
             tax_rate: Effective tax rate
             company_data: Raw company data from API
+            shares_outstanding: Shares outstanding, extracted from company_data when not given
         """
         self.income_statement = income_statement
         self.cash_flow = cash_flow
@@ -39,6 +188,7 @@ class DCFValuation:
         self.terminal_growth_rate = terminal_growth_rate
         self.tax_rate = tax_rate
         self.company_data = company_data
+        self.shares_outstanding = shares_outstanding if shares_outstanding is not None else extract_shares_outstanding(company_data)
     
     def calculate(self) -> Dict[str, Any]:
         """
@@ -47,20 +197,23 @@ class DCFValuation:
         Returns:
             Dictionary with valuation results
         """
+        # Free cash flows as one array; scalars below are read from it rather than through .iloc
+        free_cash_flow = self.cash_flow["free_cash_flow"].to_numpy()
+        
         # Get the forecast period free cash flows
         # Exclude the terminal year (last row)
-        forecast_fcf = self.cash_flow["free_cash_flow"].iloc[:-1].values
+        forecast_fcf = free_cash_flow[:-1]
         
         # Calculate terminal value
-        terminal_year_fcf = self.cash_flow["free_cash_flow"].iloc[-2]  # Second to last year
+        terminal_year_fcf = free_cash_flow[-2]  # Second to last year
         terminal_value = self._calculate_terminal_value(terminal_year_fcf)
         
         # Discount the cash flows
         forecast_years = len(forecast_fcf)
-        discount_factors = np.array([(1 + self.discount_rate) ** -t for t in range(1, forecast_years + 1)])
+        discount_factors = (1 + self.discount_rate) ** -np.arange(1, forecast_years + 1, dtype=np.float64)
         
         # PV of forecast period FCF
-        pv_forecast_fcf = np.sum(forecast_fcf * discount_factors)
+        pv_forecast_fcf = forecast_fcf @ discount_factors
         
         # PV of terminal value
         pv_terminal_value = terminal_value * discount_factors[-1]
@@ -68,14 +221,11 @@ class DCFValuation:
         # Enterprise value
         enterprise_value = pv_forecast_fcf + pv_terminal_value
         
-        # Get net debt from balance sheet (most recent period)
-        net_debt = self.balance_sheet["total_debt"].iloc[0] - self.cash_flow["cash"].iloc[0] if "cash" in self.cash_flow else self.balance_sheet["total_debt"].iloc[0]
-        
         # Equity value
-        equity_value = enterprise_value - net_debt
+        equity_value = enterprise_value - self._get_net_debt()
         
-        # Get shares outstanding from company profile
-        shares_outstanding = self._get_shares_outstanding()
+        # Shares outstanding from company profile
+        shares_outstanding = self.shares_outstanding
         
         # Price per share
         price_per_share = equity_value / shares_outstanding if shares_outstanding > 0 else 0
@@ -92,6 +242,62 @@ class DCFValuation:
             "discount_rate": self.discount_rate
         }
     
+    def calculate_grid(self, discount_rates: Any, terminal_growth_rates: Any) -> Dict[str, np.ndarray]:
+        """
+        Calculate DCF values over a grid of discount and terminal growth rates in one broadcast.
+        
+        Each grid point matches what calculate() returns for that discount_rate/terminal_growth_rate
+        pair, without building a model per point.
+        
+        Args:
+            discount_rates: Discount rates (WACC), one grid row each
+            terminal_growth_rates: Terminal growth rates, one grid column each
+            
+        Returns:
+            Dictionary of [len(discount_rates), len(terminal_growth_rates)] arrays: enterprise_value,
+            equity_value, price_per_share, terminal_value and pv_terminal_value
+        """
+        discount_rates = np.asarray(discount_rates, dtype=np.float64).reshape(-1, 1)
+        terminal_growth_rates = np.asarray(terminal_growth_rates, dtype=np.float64).reshape(1, -1)
+        
+        free_cash_flow = self.cash_flow["free_cash_flow"].to_numpy(dtype=np.float64)
+        forecast_fcf = free_cash_flow[:-1]
+        terminal_year_fcf = free_cash_flow[-2]  # Second to last year
+        
+        # Discount factors per discount rate, shape [R, N]; PV of forecast FCF per discount rate, shape [R, 1]
+        discount_factors = (1 + discount_rates) ** -np.arange(1, len(forecast_fcf) + 1, dtype=np.float64)
+        pv_forecast_fcf = discount_factors @ forecast_fcf[:, None]
+        
+        # Terminal value with growth capped at discount rate - 1%, as in _calculate_terminal_value
+        effective_growth_rates = np.where(
+            terminal_growth_rates >= discount_rates, discount_rates - 0.01, terminal_growth_rates
+        )
+        if terminal_year_fcf <= 0:
+            terminal_value = np.zeros(effective_growth_rates.shape)
+        else:
+            terminal_value = terminal_year_fcf * (1 + effective_growth_rates) / (discount_rates - effective_growth_rates)
+        pv_terminal_value = terminal_value * discount_factors[:, -1:]
+        
+        enterprise_value = pv_forecast_fcf + pv_terminal_value
+        equity_value = enterprise_value - self._get_net_debt()
+        shares_outstanding = self.shares_outstanding
+        price_per_share = equity_value / shares_outstanding if shares_outstanding > 0 else np.zeros(equity_value.shape)
+        
+        return {
+            "enterprise_value": enterprise_value,
+            "equity_value": equity_value,
+            "price_per_share": price_per_share,
+            "terminal_value": terminal_value,
+            "pv_terminal_value": pv_terminal_value
+        }
+    
+    def _get_net_debt(self) -> float:
+        """Net debt from the balance sheet (most recent period)"""
+        # Membership is checked on the columns Index explicitly, and each scalar is read once by position
+        total_debt = float(self.balance_sheet["total_debt"].iat[0])
+        cash = float(self.cash_flow["cash"].iat[0]) if "cash" in self.cash_flow.columns else 0.0
+        return total_debt - cash
+    
     def _calculate_terminal_value(self, final_year_fcf: float) -> float:
         """
         Calculate terminal value using the perpetuity growth method.
@@ -102,6 +308,9 @@ class DCFValuation:
         Returns:
             Terminal value
         """
+        # Plain float arithmetic; the FCF arrives as a numpy scalar
+        final_year_fcf = float(final_year_fcf)
+        
         # Handle edge cases
         if final_year_fcf <= 0:
             return 0.0
@@ -119,41 +328,6 @@ class DCFValuation:
             return final_year_fcf * (1 + effective_growth_rate) / (self.discount_rate - effective_growth_rate)
         except:
             return 0.0
-    
-    def _get_shares_outstanding(self) -> float:
-        """
-        Get the latest shares outstanding from company data.
-        
-        Returns:
-            Number of shares outstanding
-        """
-        # Extract shares outstanding from company profile
-        profile = self.company_data.get("profile", {})
-        
-        # Different APIs provide shares outstanding in different formats
-        shares_outstanding = 0
-        
-        # Try FMP format
-        if "mktCap" in profile and "price" in profile and profile.get("price") is not None and profile["price"] > 0:
-            # Calculate from market cap and price
-            shares_outstanding = profile["mktCap"] / profile["price"]
-        
-        # Try alternate fields that might contain shares data
-        elif "shareOutstanding" in profile:
-            shares_outstanding = profile["shareOutstanding"]
-        elif "sharesOutstanding" in profile:
-            shares_outstanding = profile["sharesOutstanding"]
-        
-        # Try key metrics if available
-        elif "key_metrics" in self.company_data:
-            metrics = self.company_data["key_metrics"]
-            if isinstance(metrics, dict) and "sharesOutstanding" in metrics:
-                shares_outstanding = metrics["sharesOutstanding"]
-            elif isinstance(metrics, list) and len(metrics) > 0 and "sharesOutstanding" in metrics[0]:
-                shares_outstanding = metrics[0]["sharesOutstanding"]
-        
-        # Ensure a valid positive number
-        return max(1, float(shares_outstanding))
 
 
 class TradingCompsValuation:
@@ -164,7 +338,8 @@ class TradingCompsValuation:
         income_statement: pd.DataFrame,
         balance_sheet: pd.DataFrame,
         ev_to_ebitda_multiple: float,
-        company_data: Dict[str, Any]
+        company_data: Dict[str, Any],
+        shares_outstanding: Optional[float] = None
     ):
         """
         Initialize the Trading Comps model.
@@ -174,11 +349,13 @@ class TradingCompsValuation:
             balance_sheet: Projected balance sheet
             ev_to_ebitda_multiple: EV/EBITDA multiple for valuation
             company_data: Raw company data from API
+            shares_outstanding: Shares outstanding, extracted from company_data when not given
         """
         self.income_statement = income_statement
         self.balance_sheet = balance_sheet
         self.ev_to_ebitda_multiple = ev_to_ebitda_multiple
         self.company_data = company_data
+        self.shares_outstanding = shares_outstanding if shares_outstanding is not None else extract_shares_outstanding(company_data)
     
     def calculate(self) -> Dict[str, Any]:
         """
@@ -188,7 +365,7 @@ class TradingCompsValuation:
             Dictionary with valuation results
         """
         # Use next year's EBITDA for forward multiple valuation
-        forward_ebitda = self.income_statement["ebitda"].iloc[1]
+        forward_ebitda = self.income_statement["ebitda"].to_numpy()[1]
         
         # Calculate enterprise value
         enterprise_value = forward_ebitda * self.ev_to_ebitda_multiple
@@ -199,15 +376,15 @@ class TradingCompsValuation:
         # Equity value
         equity_value = enterprise_value - net_debt
         
-        # Get shares outstanding from company profile
-        shares_outstanding = self._get_shares_outstanding()
+        # Shares outstanding from company profile
+        shares_outstanding = self.shares_outstanding
         
         # Price per share
         price_per_share = equity_value / shares_outstanding if shares_outstanding > 0 else 0
         
         # Calculate other common multiples
-        ev_to_revenue = enterprise_value / self.income_statement["revenue"].iloc[1]
-        price_to_earnings = equity_value / self.income_statement["net_income"].iloc[1]
+        ev_to_revenue = enterprise_value / self.income_statement["revenue"].to_numpy()[1]
+        price_to_earnings = equity_value / self.income_statement["net_income"].to_numpy()[1]
         
         return {
             "enterprise_value": enterprise_value,
@@ -219,41 +396,6 @@ class TradingCompsValuation:
             "price_to_earnings": price_to_earnings,
             "forward_ebitda": forward_ebitda
         }
-    
-    def _get_shares_outstanding(self) -> float:
-        """
-        Get the latest shares outstanding from company data.
-        
-        Returns:
-            Number of shares outstanding
-        """
-        # Extract shares outstanding from company profile
-        profile = self.company_data.get("profile", {})
-        
-        # Different APIs provide shares outstanding in different formats
-        shares_outstanding = 0
-        
-        # Try FMP format
-        if "mktCap" in profile and "price" in profile and profile.get("price") is not None and profile["price"] > 0:
-            # Calculate from market cap and price
-            shares_outstanding = profile["mktCap"] / profile["price"]
-        
-        # Try alternate fields that might contain shares data
-        elif "shareOutstanding" in profile:
-            shares_outstanding = profile["shareOutstanding"]
-        elif "sharesOutstanding" in profile:
-            shares_outstanding = profile["sharesOutstanding"]
-        
-        # Try key metrics if available
-        elif "key_metrics" in self.company_data:
-            metrics = self.company_data["key_metrics"]
-            if isinstance(metrics, dict) and "sharesOutstanding" in metrics:
-                shares_outstanding = metrics["sharesOutstanding"]
-            elif isinstance(metrics, list) and len(metrics) > 0 and "sharesOutstanding" in metrics[0]:
-                shares_outstanding = metrics[0]["sharesOutstanding"]
-        
-        # Ensure a valid positive number
-        return max(1, float(shares_outstanding))
 
 
 class LBOValuation:
@@ -269,7 +411,8 @@ class LBOValuation:
         debt_to_ebitda: float,
         discount_rate: float,
         tax_rate: float,
-        company_data: Dict[str, Any]
+        company_data: Dict[str, Any],
+        shares_outstanding: Optional[float] = None
     ):
         """
         Initialize the LBO model.
@@ -284,6 +427,7 @@ class LBOValuation:
             discount_rate: Required rate of return
             tax_rate: Effective tax rate
             company_data: Raw company data from API
+            shares_outstanding: Shares outstanding, extracted from company_data when not given
         """
         self.income_statement = income_statement
         self.cash_flow = cash_flow
@@ -294,6 +438,7 @@ class LBOValuation:
         self.discount_rate = discount_rate
         self.tax_rate = tax_rate
         self.company_data = company_data
+        self.shares_outstanding = shares_outstanding if shares_outstanding is not None else extract_shares_outstanding(company_data)
     
     def calculate(self) -> Dict[str, Any]:
         """
@@ -302,8 +447,12 @@ class LBOValuation:
         Returns:
             Dictionary with LBO analysis results
         """
+        # EBITDA and free cash flows as arrays, read by position below
+        ebitda = self.income_statement["ebitda"].to_numpy()
+        free_cash_flow = self.cash_flow["free_cash_flow"].to_numpy()
+        
         # Current EBITDA and enterprise value
-        current_ebitda = self.income_statement["ebitda"].iloc[0]
+        current_ebitda = ebitda[0]
         entry_ev = current_ebitda * self.exit_multiple  # Assuming entry at the same multiple as exit
         
         # Calculate initial debt and equity
@@ -312,13 +461,13 @@ class LBOValuation:
         
         # Exit EBITDA (using the value at the holding period year)
         exit_year = min(self.holding_period_years, len(self.income_statement) - 1)
-        exit_ebitda = self.income_statement["ebitda"].iloc[exit_year]
+        exit_ebitda = ebitda[exit_year]
         
         # Exit enterprise value
         exit_ev = exit_ebitda * self.exit_multiple
         
         # Debt repayment from free cash flow
-        debt_repayment = np.sum(self.cash_flow["free_cash_flow"].iloc[1:exit_year+1])
+        debt_repayment = np.sum(free_cash_flow[1:exit_year+1])
         remaining_debt = max(0, initial_debt - debt_repayment)
         
         # Exit equity value
@@ -332,8 +481,8 @@ class LBOValuation:
         entry_debt_to_ebitda = initial_debt / current_ebitda
         exit_debt_to_ebitda = remaining_debt / exit_ebitda if exit_ebitda > 0 else 0
         
-        # Get shares outstanding from company data
-        shares_outstanding = self._get_shares_outstanding()
+        # Shares outstanding from company data
+        shares_outstanding = self.shares_outstanding
         entry_price_per_share = initial_equity / shares_outstanding if shares_outstanding > 0 else 0
         exit_price_per_share = exit_equity / shares_outstanding if shares_outstanding > 0 else 0
         
@@ -374,45 +523,10 @@ class LBOValuation:
             return 0.0
             
         try:
-            # Simple IRR calculation assuming only initial investment and exit value
-            return np.power(exit_value / initial_investment, 1.0 / years) - 1
+            # Simple IRR calculation assuming only initial investment and exit value (plain float math)
+            return (float(exit_value) / float(initial_investment)) ** (1.0 / years) - 1
         except:
             return 0.0
-    
-    def _get_shares_outstanding(self) -> float:
-        """
-        Get the latest shares outstanding from company data.
-        
-        Returns:
-            Number of shares outstanding
-        """
-        # Extract shares outstanding from company profile
-        profile = self.company_data.get("profile", {})
-        
-        # Different APIs provide shares outstanding in different formats
-        shares_outstanding = 0
-        
-        # Try FMP format
-        if "mktCap" in profile and "price" in profile and profile.get("price") is not None and profile["price"] > 0:
-            # Calculate from market cap and price
-            shares_outstanding = profile["mktCap"] / profile["price"]
-        
-        # Try alternate fields that might contain shares data
-        elif "shareOutstanding" in profile:
-            shares_outstanding = profile["shareOutstanding"]
-        elif "sharesOutstanding" in profile:
-            shares_outstanding = profile["sharesOutstanding"]
-        
-        # Try key metrics if available
-        elif "key_metrics" in self.company_data:
-            metrics = self.company_data["key_metrics"]
-            if isinstance(metrics, dict) and "sharesOutstanding" in metrics:
-                shares_outstanding = metrics["sharesOutstanding"]
-            elif isinstance(metrics, list) and len(metrics) > 0 and "sharesOutstanding" in metrics[0]:
-                shares_outstanding = metrics[0]["sharesOutstanding"]
-        
-        # Ensure a valid positive number
-        return max(1, float(shares_outstanding))
 
 
 class ValuationEngine:
@@ -439,6 +553,12 @@ class ValuationEngine:
         self.forecast_years = forecast_years
         self.assumptions = assumptions or self._get_default_assumptions()
         self.data_provider = get_data_provider()
+        # Derived from company_data once and shared by every run (the shares by all three models)
+        self.shares_outstanding = extract_shares_outstanding(company_data)
+        self.company_name = company_data.get("profile", {}).get("name", ticker)
+        # Peer comps are fetched at most once per engine
+        self._trading_comps_cache: Optional[List[Dict[str, Any]]] = None
+        self._trading_comps_lock: Optional[asyncio.Lock] = None
         
         # Initialize statement data frames
         self.income_statement = None
@@ -458,7 +578,7 @@ class ValuationEngine:
         Returns:
             Dictionary with combined valuation results
         """
-        # Run DCF valuation
+        # DCF valuation
         dcf_valuation = DCFValuation(
             income_statement=self.income_statement,
             cash_flow=self.cash_flow,
@@ -466,20 +586,20 @@ class ValuationEngine:
             discount_rate=self.assumptions["discount_rate"],
             terminal_growth_rate=self.assumptions["terminal_growth_rate"],
             tax_rate=self.assumptions["tax_rate"],
-            company_data=self.company_data
+            company_data=self.company_data,
+            shares_outstanding=self.shares_outstanding
         )
-        dcf_results = dcf_valuation.calculate()
         
-        # Run trading comps valuation
+        # Trading comps valuation
         trading_comps_valuation = TradingCompsValuation(
             income_statement=self.income_statement,
             balance_sheet=self.balance_sheet,
             ev_to_ebitda_multiple=self.assumptions["ev_to_ebitda_multiple"],
-            company_data=self.company_data
+            company_data=self.company_data,
+            shares_outstanding=self.shares_outstanding
         )
-        trading_comps_results = trading_comps_valuation.calculate()
         
-        # Run LBO valuation
+        # LBO valuation
         lbo_valuation = LBOValuation(
             income_statement=self.income_statement,
             cash_flow=self.cash_flow,
@@ -489,12 +609,26 @@ class ValuationEngine:
             debt_to_ebitda=self.assumptions["debt_to_ebitda"],
             discount_rate=self.assumptions["discount_rate"],
             tax_rate=self.assumptions["tax_rate"],
-            company_data=self.company_data
+            company_data=self.company_data,
+            shares_outstanding=self.shares_outstanding
         )
-        lbo_results = lbo_valuation.calculate()
         
-        # Compile trading comparables from peers if available
-        trading_comps = await self._get_trading_comps()
+        def calculate_valuations() -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+            return dcf_valuation.calculate(), trading_comps_valuation.calculate(), lbo_valuation.calculate()
+        
+        # Start compiling trading comparables from peers (network I/O) before the valuation math so the
+        # fetch overlaps it; without peers there is nothing to fetch
+        peers_task = asyncio.create_task(self._get_trading_comps()) if self.company_data.get("sector_peers") else None
+        
+        # The three valuations are independent CPU work, so they run off the event loop in one worker
+        # thread while the peer fetch is in flight
+        try:
+            dcf_results, trading_comps_results, lbo_results = await asyncio.to_thread(calculate_valuations)
+        except BaseException:
+            if peers_task is not None:
+                peers_task.cancel()
+            raise
+        trading_comps = await peers_task if peers_task is not None else []
         
         # Calculate valuation range
         valuation_range = self._calculate_valuation_range(
@@ -505,7 +639,7 @@ class ValuationEngine:
         # Combine all valuation results
         return {
             "ticker": self.ticker,
-            "company_name": self._get_company_name(),
+            "company_name": self.company_name,
             "dcf_valuation": dcf_results,
             "trading_comps_valuation": trading_comps_results,
             "lbo_valuation": lbo_results,
@@ -611,11 +745,6 @@ class ValuationEngine:
     
     def _generate_forecast(self):
         """Generate financial forecasts based on historical data and assumptions"""
-        # Create forecast DataFrames
-        income_df = pd.DataFrame()
-        balance_df = pd.DataFrame()
-        cash_flow_df = pd.DataFrame()
-        
         # Get historical values to use as base for forecasting
         if not self.historical_income.empty:
             latest_revenue = self.historical_income["revenue"].iloc[0]
@@ -649,98 +778,82 @@ class ValuationEngine:
             latest_free_cash_flow = 0
             latest_cash = 0
         
-        # Generate forecast
-        for year in range(self.forecast_years + 1):  # +1 for terminal year
-            # === INCOME STATEMENT ===
-            # Revenue forecast
-            if year == 0:
-                revenue = latest_revenue
-            elif year < len(self.assumptions["revenue_growth_rates"]):
-                prev_revenue = income_df.loc[year - 1, "revenue"]
-                growth_rate = self.assumptions["revenue_growth_rates"][year - 1]
-                revenue = prev_revenue * (1 + growth_rate)
-            else:
-                # Use terminal growth rate for years beyond explicit forecast
-                prev_revenue = income_df.loc[year - 1, "revenue"]
-                revenue = prev_revenue * (1 + self.assumptions["terminal_growth_rate"])
-            
-            # Margin-based items
-            if year == 0:
-                gross_profit = latest_revenue * self.assumptions["gross_margins"][0]
-                ebitda = latest_revenue * self.assumptions["ebitda_margins"][0]
-            elif year < len(self.assumptions["gross_margins"]) and year < len(self.assumptions["ebitda_margins"]):
-                gross_profit = revenue * self.assumptions["gross_margins"][min(year, len(self.assumptions["gross_margins"]) - 1)]
-                ebitda = revenue * self.assumptions["ebitda_margins"][min(year, len(self.assumptions["ebitda_margins"]) - 1)]
-            else:
-                # Use last available margin for years beyond explicit forecast
-                gross_profit = revenue * self.assumptions["gross_margins"][-1]
-                ebitda = revenue * self.assumptions["ebitda_margins"][-1]
-            
-            # Net income (simplified)
-            depreciation = ebitda * 0.2  # Assumption: D&A is 20% of EBITDA
-            ebit = ebitda - depreciation
-            interest_expense = latest_total_debt * 0.05  # Assumption: 5% interest rate
-            pre_tax_income = ebit - interest_expense
-            tax = pre_tax_income * self.assumptions["tax_rate"]
-            net_income = pre_tax_income - tax
-            
-            # === CASH FLOW ===
-            # Operating cash flow (simplified)
-            operating_cash_flow = net_income + depreciation
-            
-            # Capital expenditures
-            capex = -revenue * self.assumptions["capex_percent_revenue"]  # Negative as it's cash outflow
-            
-            # Free cash flow
-            free_cash_flow = operating_cash_flow + capex
-            
-            # Cash balance (simplified)
-            if year == 0:
-                cash = latest_cash
-            else:
-                prev_cash = cash_flow_df.loc[year - 1, "cash"]
-                cash = prev_cash + free_cash_flow
-            
-            # === BALANCE SHEET ===
-            # Assets (simplified)
-            if year == 0:
-                total_assets = latest_total_assets
-            else:
-                prev_assets = balance_df.loc[year - 1, "total_assets"]
-                total_assets = prev_assets + free_cash_flow  # Simplified: assets grow by FCF
-            
-            # Debt (constant for simplicity)
-            total_debt = latest_total_debt
-            
-            # Equity (balancing item)
-            total_equity = total_assets - total_debt
-            total_liabilities = total_debt  # Simplified: all liabilities are debt
-            
-            # Add to DataFrames
-            income_df.loc[year, "revenue"] = revenue
-            income_df.loc[year, "gross_profit"] = gross_profit
-            income_df.loc[year, "ebitda"] = ebitda
-            income_df.loc[year, "depreciation"] = depreciation
-            income_df.loc[year, "ebit"] = ebit
-            income_df.loc[year, "interest_expense"] = interest_expense
-            income_df.loc[year, "pre_tax_income"] = pre_tax_income
-            income_df.loc[year, "tax"] = tax
-            income_df.loc[year, "net_income"] = net_income
-            
-            cash_flow_df.loc[year, "operating_cash_flow"] = operating_cash_flow
-            cash_flow_df.loc[year, "capex"] = capex
-            cash_flow_df.loc[year, "free_cash_flow"] = free_cash_flow
-            cash_flow_df.loc[year, "cash"] = cash
-            
-            balance_df.loc[year, "total_assets"] = total_assets
-            balance_df.loc[year, "total_liabilities"] = total_liabilities
-            balance_df.loc[year, "total_debt"] = total_debt
-            balance_df.loc[year, "total_equity"] = total_equity
-        
-        # Store forecast DataFrames
-        self.income_statement = income_df
-        self.balance_sheet = balance_df
-        self.cash_flow = cash_flow_df
+        # Generate forecast for every year at once (+1 for terminal year)
+        num_years = self.forecast_years + 1
+        years = np.arange(num_years)
+
+        # === INCOME STATEMENT ===
+        # Revenue forecast: explicit growth rates while available, terminal growth rate beyond them
+        growth_rates = self.assumptions["revenue_growth_rates"]
+        num_explicit_years = max(0, min(len(growth_rates), num_years) - 1)
+        revenue_factors = np.full(num_years, 1 + self.assumptions["terminal_growth_rate"], dtype=np.float64)
+        revenue_factors[0] = latest_revenue
+        revenue_factors[1:num_explicit_years + 1] = 1 + np.asarray(growth_rates[:num_explicit_years], dtype=np.float64)
+        revenue = np.cumprod(revenue_factors)
+
+        # Margin-based items; the last available margin is used for years beyond explicit forecast
+        gross_margins = np.asarray(self.assumptions["gross_margins"], dtype=np.float64)
+        ebitda_margins = np.asarray(self.assumptions["ebitda_margins"], dtype=np.float64)
+        explicit_margin = (years < len(gross_margins)) & (years < len(ebitda_margins))
+        gross_profit = revenue * gross_margins[np.where(explicit_margin, years, len(gross_margins) - 1)]
+        ebitda = revenue * ebitda_margins[np.where(explicit_margin, years, len(ebitda_margins) - 1)]
+
+        # Net income (simplified)
+        depreciation = ebitda * 0.2  # Assumption: D&A is 20% of EBITDA
+        ebit = ebitda - depreciation
+        interest_expense = np.full(num_years, latest_total_debt * 0.05)  # Assumption: 5% interest rate
+        pre_tax_income = ebit - interest_expense
+        tax = pre_tax_income * self.assumptions["tax_rate"]
+        net_income = pre_tax_income - tax
+
+        # === CASH FLOW ===
+        # Operating cash flow (simplified)
+        operating_cash_flow = net_income + depreciation
+
+        # Capital expenditures
+        capex = -revenue * self.assumptions["capex_percent_revenue"]  # Negative as it's cash outflow
+
+        # Free cash flow
+        free_cash_flow = operating_cash_flow + capex
+
+        # Cash balance (simplified): the latest cash plus the running sum of later years' FCF
+        cash = np.cumsum(np.concatenate(([latest_cash], free_cash_flow[1:])))
+
+        # === BALANCE SHEET ===
+        # Assets (simplified): assets grow by FCF
+        total_assets = np.cumsum(np.concatenate(([latest_total_assets], free_cash_flow[1:])))
+
+        # Debt (constant for simplicity)
+        total_debt = np.full(num_years, latest_total_debt, dtype=np.float64)
+
+        # Equity (balancing item)
+        total_equity = total_assets - total_debt
+        total_liabilities = total_debt  # Simplified: all liabilities are debt
+
+        # Store forecast DataFrames, one column array per line item
+        self.income_statement = pd.DataFrame({
+            "revenue": revenue,
+            "gross_profit": gross_profit,
+            "ebitda": ebitda,
+            "depreciation": depreciation,
+            "ebit": ebit,
+            "interest_expense": interest_expense,
+            "pre_tax_income": pre_tax_income,
+            "tax": tax,
+            "net_income": net_income
+        }, index=years)
+        self.balance_sheet = pd.DataFrame({
+            "total_assets": total_assets,
+            "total_liabilities": total_liabilities,
+            "total_debt": total_debt,
+            "total_equity": total_equity
+        }, index=years)
+        self.cash_flow = pd.DataFrame({
+            "operating_cash_flow": operating_cash_flow,
+            "capex": capex,
+            "free_cash_flow": free_cash_flow,
+            "cash": cash
+        }, index=years)
     
     def _get_default_assumptions(self) -> Dict[str, Any]:
         """Get default model assumptions"""
@@ -761,67 +874,109 @@ class ValuationEngine:
             "debt_to_ebitda": 4.0
         }
     
-    def _get_company_name(self) -> str:
-        """Extract company name from company data"""
-        profile = self.company_data.get("profile", {})
-        return profile.get("name", self.ticker)
-    
     async def _get_trading_comps(self) -> List[Dict[str, Any]]:
         """
-        Get trading comparables data for peer companies.
+        Get trading comparables data for peer companies, fetching them on first use.
         
         Returns:
             List of dictionaries with peer company data
         """
+        if self._trading_comps_cache is not None:
+            return self._trading_comps_cache
+        
+        # The lock is created lazily so it binds to the running event loop
+        if self._trading_comps_lock is None:
+            self._trading_comps_lock = asyncio.Lock()
+        async with self._trading_comps_lock:
+            if self._trading_comps_cache is None:
+                self._trading_comps_cache = await self._fetch_trading_comps()
+        
+        return self._trading_comps_cache
+    
+    async def _fetch_trading_comps(self) -> List[Dict[str, Any]]:
+        """
+        Fetch trading comparables data for peer companies.
+        
+        Returns:
+            List of dictionaries with peer company data (peers whose data could not be fetched are left out)
+        """
         peers = self.company_data.get("sector_peers", [])
         trading_comps = []
         
+        if not peers: # Nothing to fetch; skip the lookup machinery entirely
+            return trading_comps
+        
         if not self.data_provider: # Should always be initialized, but as a safe guard
-            print("Warning: Data provider not available in ValuationEngine for fetching trading comps.")
+            logger.warning("Data provider not available in ValuationEngine for fetching trading comps")
             return trading_comps
 
-        for peer_ticker in peers[:5]:  # Limit to top 5 peers for performance
-            try:
-                peer_profile = await self.data_provider.get_company_profile(peer_ticker)
-                peer_metrics_list = await self.data_provider.get_key_metrics(peer_ticker, period='annual') # FMP returns list
-                
-                # FMP key_metrics usually returns a list with one item for the most recent period
-                peer_metrics = {}
-                if isinstance(peer_metrics_list, list) and len(peer_metrics_list) > 0:
-                    peer_metrics = peer_metrics_list[0]
-                elif isinstance(peer_metrics_list, dict): # SEC provider might return dict directly
-                    peer_metrics = peer_metrics_list
-
-                name = peer_profile.get("companyName", peer_profile.get("name", peer_ticker))
-                
-                # FMP specific field names, SEC might differ or not provide all
-                ev_to_ebitda = peer_metrics.get("enterpriseValueOverEBITDA", 0.0)
-                ev_to_revenue = peer_metrics.get("evToSales", peer_metrics.get("enterpriseValueOverSales", 0.0))
-                price_to_earnings = peer_metrics.get("peRatio", peer_metrics.get("priceEarningsRatio", 0.0))
-                debt_to_ebitda = peer_metrics.get("debtToEbitda", 0.0)
-
-                trading_comps.append({
-                    "ticker": peer_ticker,
-                    "name": name,
-                    "ev_to_ebitda": float(ev_to_ebitda) if ev_to_ebitda else 0.0,
-                    "ev_to_revenue": float(ev_to_revenue) if ev_to_revenue else 0.0,
-                    "price_to_earnings": float(price_to_earnings) if price_to_earnings else 0.0,
-                    "debt_to_ebitda": float(debt_to_ebitda) if debt_to_ebitda else 0.0
-                })
-            except Exception as e:
-                print(f"Warning: Could not fetch data for peer {peer_ticker}: {e}")
-                # Optionally append with placeholder/default values if a peer fails
-                trading_comps.append({
-                    "ticker": peer_ticker,
-                    "name": peer_ticker,
-                    "ev_to_ebitda": 0.0,
-                    "ev_to_revenue": 0.0,
-                    "price_to_earnings": 0.0,
-                    "debt_to_ebitda": 0.0
-                })
+        # One batched lookup per data type instead of a profile and a metrics request per peer
+        peers = list(peers[:5])  # Limit to top 5 peers for performance
+        provider = self.data_provider
+        peer_profiles, peer_metrics = await asyncio.gather(
+            _cached_peer_batch(provider, "profile", peers, provider.get_company_profiles_batch),
+            _cached_peer_batch(
+                provider, "key_metrics", peers,
+                lambda tickers: provider.get_key_metrics_batch(tickers, period='annual') # FMP returns list
+            ),
+            return_exceptions=True
+        )
+        if isinstance(peer_profiles, BaseException):
+            logger.warning("Could not fetch peer profiles: %s", peer_profiles)
+            peer_profiles = {}
+        if isinstance(peer_metrics, BaseException):
+            logger.warning("Could not fetch peer key metrics: %s", peer_metrics)
+            peer_metrics = {}
+        
+        for peer_ticker in peers:
+            peer_comp = self._build_peer_comp(peer_ticker, peer_profiles.get(peer_ticker), peer_metrics.get(peer_ticker))
+            if peer_comp is not None:
+                trading_comps.append(peer_comp)
         
         return trading_comps
     
+    def _build_peer_comp(
+        self,
+        peer_ticker: str,
+        peer_profile: Optional[Dict[str, Any]],
+        peer_metrics_list: Any
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build trading comparables data for one peer company.
+        
+        Args:
+            peer_ticker: Peer company ticker
+            peer_profile: Peer profile, or None if it could not be fetched
+            peer_metrics_list: Peer key metrics, or None if they could not be fetched
+            
+        Returns:
+            Dictionary with peer company data, or None if the peer data is missing
+        """
+        try:
+            if peer_profile is None:
+                raise ValueError("no profile returned")
+            if peer_metrics_list is None:
+                raise ValueError("no key metrics returned")
+
+            # FMP key_metrics usually returns a list with one item for the most recent period
+            peer_metrics = {}
+            if isinstance(peer_metrics_list, list) and len(peer_metrics_list) > 0:
+                peer_metrics = peer_metrics_list[0]
+            elif isinstance(peer_metrics_list, dict): # SEC provider might return dict directly
+                peer_metrics = peer_metrics_list
+
+            name = peer_profile.get("companyName", peer_profile.get("name", peer_ticker))
+
+            peer_comp = {"ticker": peer_ticker, "name": name}
+            for field, keys in _PEER_METRIC_FIELDS:
+                peer_comp[field] = _peer_metric(peer_metrics, keys)
+            return peer_comp
+        except Exception as e:
+            # Skip the peer rather than report a row of zero multiples
+            logger.warning("Could not fetch data for peer %s: %s", peer_ticker, e)
+            return None
+
+
     def _calculate_valuation_range(self, dcf_price: float, comps_price: float) -> Dict[str, float]:
         """
         Calculate valuation range based on different methods.
@@ -844,4 +999,30 @@ class ValuationEngine:
             "avg_price": avg_price,
             "dcf_price": dcf_price,
             "comps_price": comps_price
+        }
+    
+    @staticmethod
+    def calculate_valuation_ranges(dcf_prices: Any, comps_prices: Any) -> Dict[str, np.ndarray]:
+        """
+        Calculate valuation ranges for many DCF/comps price pairs at once (e.g. a batch of tickers).
+        
+        Element i matches _calculate_valuation_range(dcf_prices[i], comps_prices[i]); NaN prices
+        propagate to that element's min/max instead of depending on argument order.
+        
+        Args:
+            dcf_prices: Prices per share from DCF valuation
+            comps_prices: Prices per share from trading comps valuation (same shape)
+            
+        Returns:
+            Dictionary of arrays: min_price, max_price, avg_price, dcf_price and comps_price
+        """
+        dcf_prices = np.asarray(dcf_prices, dtype=np.float64)
+        comps_prices = np.asarray(comps_prices, dtype=np.float64)
+        
+        return {
+            "min_price": np.minimum(dcf_prices, comps_prices) * 0.9,  # 10% below minimum
+            "max_price": np.maximum(dcf_prices, comps_prices) * 1.1,  # 10% above maximum
+            "avg_price": (dcf_prices + comps_prices) / 2,
+            "dcf_price": dcf_prices,
+            "comps_price": comps_prices
         } 
\ No newline at end of file
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+"""
+Production entry point for the CapitalCanvas backend server.
+Loads environment variables and runs the FastAPI app under Gunicorn with Uvicorn workers.
+"""
+
+import os
+import logging
+
+from load_env import load_environment, set_app_log_level
+
+def start_production_server():
+    """
+    Replace this process with Gunicorn serving main:app through pre-forked Uvicorn workers.
+    
+    WEB_CONCURRENCY sets the worker count. It defaults to 1 because /api/model job progress
+    is kept in process memory, so polling only works while every request reaches the same worker.
+    """
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    workers = os.getenv("WEB_CONCURRENCY", "1")
+    port = os.getenv("PORT", "9000")
+    
+    # --preload imports the app once in the master so workers share its modules copy-on-write
+    os.execvp("gunicorn", [
+        "gunicorn",
+        "--chdir", current_dir,
+        "-k", "uvicorn.workers.UvicornWorker",
+        "-w", workers,
+        "-b", f"0.0.0.0:{port}",
+        "--preload",
+        "main:app",
+    ])
+
+if __name__ == "__main__":
+    # Plain synchronous logging: the process is replaced by Gunicorn right after setup
+    logging.basicConfig()
+    set_app_log_level(logging.INFO)
+    
+    # Variables loaded here are inherited by Gunicorn and its workers
+    load_environment()
+    start_production_server()
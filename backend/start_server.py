@@ -10,6 +10,8 @@ from pathlib import Path
 import uvicorn
 from dotenv import load_dotenv
 
+from load_env import configure_logging
+
 def start_server():
     # Get the directory of the current file
     current_dir = Path(__file__).parent.absolute()
@@ -45,6 +47,10 @@ def start_server():
         print(f"Error: At least one of these API keys is required: {', '.join(api_keys)}")
         sys.exit(1)
     
+    # Auto-reload polls the source tree, so it is opt-in for local development (UVICORN_RELOAD=1)
+    reload = os.getenv("UVICORN_RELOAD", "0") == "1"
+    reload_options = {"reload_dirs": [str(current_dir)]} if reload else {}
+    
     # Start the server
     port = 9001
     print(f"Starting server on port {port}...")
@@ -52,9 +58,10 @@ def start_server():
         "main:app",
         host="0.0.0.0",
         port=port,
-        reload=True,
-        reload_dirs=[str(current_dir)]
+        reload=reload,
+        **reload_options
     )
 
 if __name__ == "__main__":
+    configure_logging()
     start_server()